@@ -1,24 +1,132 @@
 '''Advent of code 2021: Day 01
 '''
 
+from collections import deque
+from functools import partial
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
 
-def count_increases(readings: list[int]) -> int:
+import numpy as np
+
+from aoc.cache import cached_parser
+from aoc.inputs import int_array, map_chunks, read_ints, read_range
+
+
+def count_increases(readings: np.ndarray) -> int:
     '''Count how often a reading increases from the previous one.
     '''
-    return len([x for x, y in zip(readings[:-1], readings[1:]) if x < y])
+    return count_window_increases(readings, window_len = 1)
 
 
-def count_window_increases(readings: list[int], window_len: int = 3) -> int:
+def count_window_increases(readings: np.ndarray, window_len: int = 3) -> int:
     '''Calculate moving sums of readings and count how often each window 
     increases from the previous.
+
+    Consecutive windows share all but one reading, so a window's sum goes up
+    exactly when the reading entering it beats the one leaving it:
+    readings[i + window_len] > readings[i]. No sums are needed.
     '''
-    windows = (readings[i:(i + window_len)] for i in range(len(readings)))
-    next_windows = (readings[i:(i+ window_len)] for i in range(1, len(readings)))
+    readings = np.asarray(readings)
+    if window_len >= len(readings):
+        return 0
+    return int(np.count_nonzero(readings[window_len:] > readings[:-window_len]))
 
-    increasing_windows = (x for x, y in zip(windows, next_windows) 
-                          if sum(x) < sum(y) and len(x) == window_len and len(y) == window_len)
-    
-    return len(list(increasing_windows))
+
+def count_window_increases_batch(readings: np.ndarray, window_lens: Iterable[int]) -> Dict[int, int]:
+    '''Count window increases for many window lengths over the same readings.
+    '''
+    readings = np.asarray(readings)
+    return {w: count_window_increases(readings, w) for w in window_lens}
+
+
+class ChunkCounts(NamedTuple):
+    counts: Dict[int, int]
+    # The first and last readings of the chunk, as many as the longest window
+    head: np.ndarray
+    tail: np.ndarray
+    nreadings: int
+
+
+def count_chunk(input: str, start: int, end: int, window_lens: Tuple[int, ...]) -> ChunkCounts:
+    '''Count window increases within a byte range of an input file.
+    '''
+    readings = int_array(read_range(input, start, end))
+    longest = max(window_lens)
+    return ChunkCounts(count_window_increases_batch(readings, window_lens),
+                       readings[:longest].copy(), readings[-longest:].copy(), len(readings))
+
+
+def count_window_increases_chunked(input: str,
+                                   window_lens: Iterable[int] = (1, 3),
+                                   chunk_size: int = 2**26,
+                                   jobs: Optional[int] = None) -> Dict[int, int]:
+    '''Count window increases in an input file too big to read at once.
+
+    The file is split into chunks of lines that worker processes count
+    separately. Increases between readings in different chunks are then
+    counted by carrying the last readings seen (as many as the longest
+    window) across each boundary, so each process only holds one chunk.
+    '''
+    window_lens = tuple(dict.fromkeys(window_lens))
+    longest = max(window_lens)
+    chunks = map_chunks(partial(count_chunk, window_lens = window_lens), input, chunk_size, jobs)
+
+    totals = {w: 0 for w in window_lens}
+    carry = np.zeros(0, dtype = np.int64)
+    for chunk in chunks:
+        # Pair the carried readings with the start of this chunk, counting
+        # only the pairs that straddle the boundary.
+        joined = np.concatenate([carry, chunk.head])
+        for w in window_lens:
+            totals[w] += chunk.counts[w]
+            first = max(len(carry) - w, 0)
+            last = min(len(carry), len(joined) - w)
+            if last > first:
+                totals[w] += int(np.count_nonzero(joined[first + w:last + w] > joined[first:last]))
+        carry = chunk.tail if chunk.nreadings >= longest else joined[-longest:]
+
+    return totals
+
+
+@cached_parser(version = 2)
+def read_readings(input: str) -> np.ndarray:
+    '''Read the sonar readings from an input file.
+    '''
+    return read_ints(input)
+
+
+def part_1(input: str) -> int:
+    '''Count reading increases in an input file.
+    '''
+    return count_increases(read_readings(input))
+
+
+def part_2(input: str) -> int:
+    '''Count window increases in an input file.
+    '''
+    return count_window_increases(read_readings(input))
+
+
+def solve_stream(lines: Iterable[str], window_len: int = 3) -> Tuple[int, int]:
+    '''Count reading increases and window increases in one pass over lines of readings.
+
+    Consecutive windows share all but one reading, so a window's sum goes up
+    exactly when the reading entering it beats the one leaving it. Only the
+    last window_len readings are kept.
+    '''
+    recent = deque(maxlen = window_len)
+    increases, window_increases = 0, 0
+
+    for line in lines:
+        if not line.strip():
+            continue
+        reading = int(line)
+        if recent:
+            increases += reading > recent[-1]
+        if len(recent) == window_len:
+            window_increases += reading > recent[0]
+        recent.append(reading)
+
+    return increases, window_increases
 
 
 # Example from the instructions
@@ -41,11 +149,12 @@ if __name__ == '__main__':
     # Test instruction example
     assert count_increases([int(r) for r in test_01.splitlines()]) == 7, "Test 1 failed"
     assert count_window_increases([int(r) for r in test_01.splitlines()]) == 5, "Test 2 failed"
+    assert solve_stream(test_01.splitlines()) == (7, 5), "Stream test failed"
+    assert count_window_increases_batch([int(r) for r in test_01.splitlines()], (1, 3)) == {1: 7, 3: 5}, "Batch test failed"
     # Run on input
-    with open(input, 'rt') as f:
-        readings = [int(row.strip()) for row in f]
-        print('Part 1:', count_increases(readings))
-        print('Part 1:', count_window_increases(readings))
+    print('Part 1:', part_1(input))
+    print('Part 2:', part_2(input))
+    assert count_window_increases_chunked(input, chunk_size = 2**10) == {1: part_1(input), 3: part_2(input)}, "Chunked test failed"
 
 
 
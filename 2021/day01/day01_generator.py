@@ -0,0 +1,20 @@
+'''Advent of Code 2021: Day 01 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate sonar readings, one depth per line.
+
+    Depths follow a random walk that drifts deeper. A scale of 1 gives as many
+    readings as the puzzle input (2,000).
+    '''
+    rng = random.Random(seed)
+    depth = rng.randint(100, 200)
+    readings = []
+    for _ in range(max(2, round(2000 * scale))):
+        depth = max(0, depth + rng.randint(-10, 15))
+        readings.append(f'{depth}\n')
+
+    return ''.join(readings)
@@ -1,33 +1,62 @@
 '''Advent of Code 2021: Day 02
 '''
 
+from functools import reduce
 import re
-from typing import Iterable, Tuple
+from typing import AnyStr, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from aoc.cache import cached_parser
+from aoc.inputs import Buffer, int_array, map_chunks, mapped, read_range
 
 Position = Tuple[int, int]
 Movement = Tuple[int, int]
 
+DIRECTIONS = {'up': (0, -1), 'down': (0, 1), 'forward': (1, 0)}
+MOVEMENT = re.compile(r'(?P<dir>^down|up|forward)\s+(?P<n>\d+)$')
+
+# Commands told apart by their first character, as a str or a byte: the
+# direction of the move and where its number starts
+COMMANDS = {}
+for name, (x, y) in DIRECTIONS.items():
+    COMMANDS[name[0]] = COMMANDS[ord(name[0])] = (x, y, len(name) + 1)
+
 
 def parse_movement(s: str) -> Movement:
     '''Parse a string movement command into horizontal and vertical position changes.
     
     E.g. 'down 5' -> (0, 5); 'forward 3' -> (3, 0)
     '''
-    directions = {'up': (0, -1), 'down': (0, 1), 'forward': (1, 0)}
-    parsed = re.match(r'(?P<dir>^down|up|forward)\s+(?P<n>\d+)$', s)
-    x, y = directions[parsed['dir']]
+    parsed = MOVEMENT.match(s)
+    x, y = DIRECTIONS[parsed['dir']]
     n = int(parsed['n'])
     return (x * n, y * n)
 
 
+def parse_command(line: AnyStr) -> Movement:
+    '''Parse a movement command, as a str or as bytes, by its first character.
+
+    Unlike parse_movement, the command isn't checked: it's only meant for
+    well-formed input, with one space between the direction and the number.
+    '''
+    x, y, start = COMMANDS[line[0]]
+    n = int(line[start:])
+    return (x * n, y * n)
+
+
 def move(movements: Iterable[Movement], 
          initial_position: Position = (0, 0)) -> Position:
     '''Move the submarine.
     
     Returns the final position (horizontal, depth/vertical) after making all the movements.
     '''
-    x0, y0 = initial_position
-    return (x0 + sum(dx for dx, dy in movements), y0 + sum(dy for dx, dy in movements))
+    x, y = initial_position
+    for dx, dy in movements:
+        x += dx
+        y += dy
+
+    return (x, y)
 
 
 def move_by_aim(movements: Iterable[Movement], 
@@ -48,6 +77,77 @@ def move_by_aim(movements: Iterable[Movement],
     return (x, y)
 
 
+class AimedMove(NamedTuple):
+    '''The effect of a run of movements when moving by aim.
+
+    Starting with an aim of a, the run moves forward by forward, changes the
+    aim by aim, and goes down by depth + a * forward. Runs combine in order
+    with `then`, so a long log can be summarized in pieces.
+    '''
+    forward: int = 0
+    aim: int = 0
+    # Depth gained starting with no aim
+    depth: int = 0
+
+    def then(self, other: 'AimedMove') -> 'AimedMove':
+        return AimedMove(self.forward + other.forward,
+                         self.aim + other.aim,
+                         self.depth + other.depth + self.aim * other.forward)
+
+
+def parse_commands(buf: Buffer) -> Tuple[np.ndarray, np.ndarray]:
+    '''Parse lines of movement commands into arrays of horizontal and vertical
+    position changes, with NumPy.
+    '''
+    data = np.frombuffer(buf, dtype = np.uint8)
+    starts = np.concatenate([[0], np.flatnonzero(data == ord('\n')) + 1])
+    starts = starts[starts < len(data)]
+    firsts = data[starts]
+    firsts = firsts[(firsts != ord('\n')) & (firsts != ord('\r'))]
+
+    n = int_array(buf, negative = False)
+    dx = np.where(firsts == ord('f'), n, 0)
+    dy = np.where(firsts == ord('d'), n, 0) - np.where(firsts == ord('u'), n, 0)
+    return dx, dy
+
+
+def summarize_movements(dx: np.ndarray, dy: np.ndarray) -> AimedMove:
+    '''Summarize arrays of position changes as a single aimed move.
+
+    The aim before each move is a running sum of the vertical changes, and
+    the depth is the sum of each forward move times that aim.
+    '''
+    aim = np.cumsum(dy)
+    return AimedMove(int(dx.sum()), int(aim[-1]) if len(aim) else 0, int((aim * dx).sum()))
+
+
+def summarize_commands(buf: Buffer) -> AimedMove:
+    '''Summarize lines of movement commands as a single aimed move, with NumPy.
+    '''
+    return summarize_movements(*parse_commands(buf))
+
+
+def summarize_chunk(input: str, start: int, end: int) -> AimedMove:
+    '''Summarize the movement commands in a byte range of an input file.
+    '''
+    return summarize_commands(read_range(input, start, end))
+
+
+def move_by_aim_chunked(input: str,
+                        initial_position: Position = (0, 0),
+                        chunk_size: int = 2**26,
+                        jobs: Optional[int] = None) -> Position:
+    '''Move the submarine by aim with the commands in an input file too big to read at once.
+
+    Chunks of the file are summarized in worker processes, then the
+    summaries are combined in order.
+    '''
+    total = reduce(AimedMove.then, map_chunks(summarize_chunk, input, chunk_size, jobs), AimedMove())
+
+    x, y = initial_position
+    return (x + total.forward, y + total.depth)
+
+
 def summarize_position(position):
     '''Summarize the position by multiplying the horizontal and vertical positions.
     '''
@@ -55,6 +155,54 @@ def summarize_position(position):
     return x * y
 
 
+def move_both(movements: Iterable[Movement],
+              initial_position: Position = (0, 0)) -> Tuple[Position, Position]:
+    '''Move the submarine both plainly and by aim, in one pass over the movements.
+
+    The aim when moving by aim is the depth change when moving plainly, so
+    one running sum serves both. Returns the final positions of move and
+    move_by_aim.
+    '''
+    x, y = initial_position
+    aim, aimed_y = 0, y
+    for dx, dy in movements:
+        x += dx
+        aim += dy
+        aimed_y += aim * dx
+
+    return (x, y + aim), (x, aimed_y)
+
+
+@cached_parser(version = 3)
+def read_movements(input: str) -> Tuple[np.ndarray, np.ndarray]:
+    '''Read the movement commands from an input file as arrays of horizontal
+    and vertical position changes.
+    '''
+    with mapped(input) as buf:
+        return parse_commands(buf)
+
+
+def part_1(input: str) -> int:
+    '''Summarize the position after moving with the commands in an input file.
+    '''
+    dx, dy = read_movements(input)
+    return summarize_position((int(dx.sum()), int(dy.sum())))
+
+
+def part_2(input: str) -> int:
+    '''Summarize the position after moving by aim with the commands in an input file.
+    '''
+    total = summarize_movements(*read_movements(input))
+    return summarize_position((total.forward, total.depth))
+
+
+def solve_stream(lines: Iterable[AnyStr]) -> Tuple[int, int]:
+    '''Summarize the position after both kinds of moving, in one pass over lines of commands.
+    '''
+    position, aimed_position = move_both(parse_command(line.strip()) for line in lines if line.strip())
+    return summarize_position(position), summarize_position(aimed_position)
+
+
 # Example from the instructions
 test_01 = '''forward 5
 down 5
@@ -70,9 +218,12 @@ if __name__ == '__main__':
     # Test on instruction example
     assert summarize_position(move([parse_movement(m.strip()) for m in test_01.splitlines()])) == 150, "Test 1 failed"
     assert summarize_position(move_by_aim([parse_movement(m.strip()) for m in test_01.splitlines()])) == 900, "Test 2 failed"
+    assert summarize_position(move(parse_movement(m.strip()) for m in test_01.splitlines())) == 150, "Generator test failed"
+    assert solve_stream(test_01.splitlines()) == (150, 900), "Stream test failed"
+    assert solve_stream(test_01.encode().splitlines()) == (150, 900), "Bytes stream test failed"
+    assert summarize_commands(test_01.encode()) == AimedMove(15, 10, 60), "Summary test failed"
 
     # Run on input
-    with open(input, 'rt') as f:
-        movements = [parse_movement(row.strip()) for row in f]
-        print('Part 1:', summarize_position(move(movements)))
-        print('Part 2:', summarize_position(move_by_aim(movements)))
\ No newline at end of file
+    print('Part 1:', part_1(input))
+    print('Part 2:', part_2(input))
+    assert summarize_position(move_by_aim_chunked(input, chunk_size = 2**10)) == part_2(input), "Chunked test failed"
\ No newline at end of file
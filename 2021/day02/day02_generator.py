@@ -0,0 +1,14 @@
+'''Advent of Code 2021: Day 02 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate submarine movement commands, e.g. "forward 5".
+
+    A scale of 1 gives as many commands as the puzzle input (1,000).
+    '''
+    rng = random.Random(seed)
+    directions = rng.choices(['forward', 'down', 'up'], weights = [4, 4, 2], k = max(1, round(1000 * scale)))
+    return ''.join(f'{d} {rng.randint(1, 9)}\n' for d in directions)
@@ -2,10 +2,18 @@
 '''
 
 from collections import Counter
-from typing import Callable, List
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from aoc.cache import cached_parser
+from aoc.grid import Grid
+from aoc.inputs import Buffer, mapped
 
 Report = List[str]
 BitFilter = Callable[[Report], str]
+# A report as an (n, width) array of 0s and 1s, one row per number
+BitMatrix = np.ndarray
 
 
 def most_common_bits(report: Report) -> str:
@@ -47,6 +55,42 @@ def compute_power(report: Report) -> int:
     return gamma * epsilon
 
 
+def parse_bit_matrix(buf: Buffer) -> BitMatrix:
+    '''Parse lines of binary numbers into a matrix of bits.
+    '''
+    return (Grid.from_bytes(buf).cells == ord('1')).astype(np.uint8)
+
+
+def to_bit_matrix(report: Report) -> BitMatrix:
+    '''Convert a report of binary numbers to a matrix of bits.
+    '''
+    return parse_bit_matrix('\n'.join(report).encode())
+
+
+def pack_bits(bits: BitMatrix) -> np.ndarray:
+    '''Pack each row of a matrix of up to 64 bits into an unsigned integer,
+    most significant bit first.
+    '''
+    width = bits.shape[-1]
+    if width > 64:
+        raise ValueError(f'Numbers of {width} bits are too wide to pack.')
+    shifts = np.arange(width - 1, -1, -1, dtype = np.uint64)
+    return np.bitwise_or.reduce(bits.astype(np.uint64) << shifts, axis = -1)
+
+
+def compute_power_bits(bits: BitMatrix) -> int:
+    '''Compute the sub's power from a matrix of bits.
+
+    The ones in each column are counted all at once. The gamma rate packs the
+    most common bits and the epsilon rate is its complement.
+    '''
+    nrows, width = bits.shape
+    ones = bits.sum(axis = 0, dtype = np.int64)
+    gamma = int(pack_bits(2 * ones >= nrows))
+    epsilon = ~gamma & ((1 << width) - 1)
+    return gamma * epsilon
+
+
 def apply_bit_filter(report: Report, bit_filter: BitFilter) -> str:
     '''Filter a report to a single number by successively applying a bitstring filter.
     '''
@@ -79,6 +123,117 @@ def compute_life_support_rating(report: Report) -> int:
     return compute_co2_scrubber_rating(report) * compute_oxygen_rating(report)
 
 
+def filter_sorted(values: np.ndarray, width: int, keep_most_common: bool) -> int:
+    '''Apply a bit filter to numbers sorted in ascending order.
+
+    The numbers left after filtering on the first digits all share a prefix,
+    so they sit in one contiguous range of the sorted numbers, with those
+    followed by a 0 before those followed by a 1. Each step bisects the range
+    where that next bit turns to 1, without looking at the numbers in it.
+    '''
+    lo, hi = 0, len(values)
+    prefix = 0
+    for shift in range(width - 1, -1, -1):
+        if hi - lo <= 1:
+            break
+        split = int(np.searchsorted(values, np.uint64(prefix | 1 << shift)))
+        zeros, ones = split - lo, hi - split
+        if zeros == 0 or ones == 0:
+            keep_ones = ones > 0
+        else:
+            keep_ones = (ones >= zeros) == keep_most_common
+        if keep_ones:
+            lo, prefix = split, prefix | 1 << shift
+        else:
+            hi = split
+
+    return int(values[lo])
+
+
+def compute_life_support_rating_bits(bits: BitMatrix) -> int:
+    '''Compute the life support rating from a matrix of bits.
+
+    The numbers are packed and sorted once, then both ratings are found by
+    bisection.
+    '''
+    values = np.sort(pack_bits(bits))
+    width = bits.shape[1]
+    return filter_sorted(values, width, keep_most_common = True) * filter_sorted(values, width, keep_most_common = False)
+
+
+@cached_parser()
+def read_bit_matrix(input: str) -> BitMatrix:
+    '''Read a report of binary numbers from an input file as a matrix of bits.
+    '''
+    with mapped(input) as buf:
+        return parse_bit_matrix(buf)
+
+
+def part_1(input: str) -> int:
+    '''Compute the power from a report in an input file.
+    '''
+    return compute_power_bits(read_bit_matrix(input))
+
+
+def part_2(input: str) -> int:
+    '''Compute the life support rating from a report in an input file.
+    '''
+    return compute_life_support_rating_bits(read_bit_matrix(input))
+
+
+def filter_prefix_counts(prefix_counts: Dict[str, int], nbits: int, keep_most_common: bool) -> str:
+    '''Apply a bit filter using counts of how many numbers start with each prefix.
+
+    The numbers left after filtering on the first digits are exactly those
+    sharing a prefix, so the counts for that prefix followed by 0 and by 1
+    say which digit is most common among them.
+    '''
+    prefix = ''
+    for _ in range(nbits):
+        zeros, ones = prefix_counts[prefix + '0'], prefix_counts[prefix + '1']
+        if zeros == 0 or ones == 0:
+            prefix += '1' if ones else '0'
+        elif keep_most_common:
+            prefix += '1' if ones >= zeros else '0'
+        else:
+            prefix += '0' if zeros <= ones else '1'
+
+    return prefix
+
+
+def solve_stream(lines: Iterable[str]) -> Tuple[int, int]:
+    '''Compute the power and the life support rating in one pass over lines of a report.
+
+    Rather than the report itself, this keeps how many numbers start with
+    each prefix. There are at most 2**(width + 1) prefixes, so for narrow
+    reports memory stops growing however many lines are read. For wide
+    reports that bound is out of reach, and memory grows with the number
+    of lines times the width.
+    '''
+    prefix_counts = Counter()
+    ones, nrows = [], 0
+    for line in lines:
+        row = line.strip()
+        if not row:
+            continue
+        if len(ones) < len(row):
+            ones.extend([0] * (len(row) - len(ones)))
+        for i, digit in enumerate(row):
+            ones[i] += digit == '1'
+        prefix_counts.update(row[:i] for i in range(1, len(row) + 1))
+        nrows += 1
+
+    if not nrows:
+        return 0, 0
+    nbits = len(ones)
+    gamma = ''.join('1' if n >= nrows - n else '0' for n in ones)
+    power = int(gamma, base = 2) * int(flip_bits(gamma), base = 2)
+
+    oxygen = filter_prefix_counts(prefix_counts, nbits, keep_most_common = True)
+    co2 = filter_prefix_counts(prefix_counts, nbits, keep_most_common = False)
+    return power, int(oxygen, base = 2) * int(co2, base = 2)
+
+
 # Example from the instructions
 test_01 = '''00100
 11110
@@ -100,9 +255,10 @@ if __name__ == '__main__':
     # Test example from instructions
     assert compute_power([row.strip() for row in test_01.splitlines()]) == 198, "Test 1 failed"
     assert compute_life_support_rating([row.strip() for row in test_01.splitlines()]) == 230, "Test 2 failed"
+    assert solve_stream(test_01.splitlines()) == (198, 230), "Stream test failed"
+    assert compute_power_bits(to_bit_matrix(test_01.splitlines())) == 198, "Bit matrix test failed"
+    assert compute_life_support_rating_bits(to_bit_matrix(test_01.splitlines())) == 230, "Bit matrix test failed"
 
     # Run on input
-    with open(input, 'rt') as f:
-        report = [row.strip() for row in f]
-        print('Part 1:', compute_power(report))
-        print('Part 2:', compute_life_support_rating(report))
+    print('Part 1:', part_1(input))
+    print('Part 2:', part_2(input))
@@ -0,0 +1,42 @@
+'''Advent of Code 2021: Day 03 input generator
+'''
+
+import random
+
+
+def filters_to_one(numbers: list[int], width: int) -> bool:
+    '''Check that the CO2 scrubber filter ends on a single number.
+
+    The filter keeps the numbers with the least common bit. If all the
+    remaining numbers have the same bit, the least common one is on none of
+    them and the filter keeps no numbers. Reports where that happens are
+    resampled.
+    '''
+    remaining = numbers
+    for shift in range(width - 1, -1, -1):
+        if len(remaining) <= 1:
+            break
+        ones = [n for n in remaining if n >> shift & 1]
+        zeros = [n for n in remaining if not n >> shift & 1]
+        remaining = ones if len(ones) < len(zeros) else zeros
+
+    return len(remaining) == 1
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate a diagnostic report of distinct binary numbers, one per line.
+
+    The numbers are distinct, and are resampled until the CO2 scrubber filter
+    narrows down to a single number. Numbers are 12 bits wide, as in the puzzle
+    input, and get wider when there are too many rows for 12 bits. A scale of 1
+    gives as many rows as the puzzle input (1,000).
+    '''
+    rng = random.Random(seed)
+    nrows = max(1, round(1000 * scale))
+    width = max(12, nrows.bit_length() + 1)
+
+    numbers = rng.sample(range(2**width), nrows)
+    while not filters_to_one(numbers, width):
+        numbers = rng.sample(range(2**width), nrows)
+
+    return ''.join(f'{n:0{width}b}\n' for n in numbers)
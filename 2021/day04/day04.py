@@ -2,7 +2,13 @@
 '''
 
 from dataclasses import dataclass, field
-from typing import List, Set, Tuple
+from typing import Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+from aoc.cache import cached_parser
+from aoc.inputs import int_array, records
+from aoc.instrument import instrumented
 
 @dataclass
 class Player:
@@ -16,6 +22,7 @@ class Player:
         else:
             return None
 
+    @instrumented()
     def check_win(self):
         row_idxs = list(range(5))
         
@@ -38,6 +45,72 @@ class Game:
     players: List[Player]
 
 
+Cell = Tuple[int, int, int]
+
+
+@dataclass
+class BingoHall:
+    '''Many cards played live, draw by draw.
+
+    An index from each number to the (card, row, col) cells holding it means
+    a draw only touches those cells. Each card keeps a count of marked cells
+    per row and column and a running sum of its unmarked numbers, so a draw
+    costs O(occurrences) and a score costs O(1).
+    '''
+    cards: List[List[List[int]]]
+    index: Dict[int, List[Cell]] = field(init = False)
+    row_hits: List[List[int]] = field(init = False)
+    col_hits: List[List[int]] = field(init = False)
+    unmarked: List[int] = field(init = False)
+    won: List[bool] = field(init = False)
+
+    def __post_init__(self):
+        self.index = {}
+        for c, card in enumerate(self.cards):
+            for i, row in enumerate(card):
+                for j, number in enumerate(row):
+                    self.index.setdefault(number, []).append((c, i, j))
+
+        self.row_hits = [[0] * 5 for _ in self.cards]
+        self.col_hits = [[0] * 5 for _ in self.cards]
+        self.unmarked = [sum(map(sum, card)) for card in self.cards]
+        self.won = [False] * len(self.cards)
+
+    def draw(self, number: int) -> List[int]:
+        '''Mark a number on every card, returning the cards that win with it, in order.
+        '''
+        winners = []
+        # Popping the number means drawing it again marks nothing
+        for c, i, j in self.index.pop(number, []):
+            self.row_hits[c][i] += 1
+            self.col_hits[c][j] += 1
+            self.unmarked[c] -= number
+            if not self.won[c] and (self.row_hits[c][i] == 5 or self.col_hits[c][j] == 5):
+                self.won[c] = True
+                winners.append(c)
+
+        return winners
+
+    def score(self, card: int, draw: int) -> int:
+        return self.unmarked[card] * draw
+
+
+def summarize_game_incremental(game: Game, has_squid: bool = False) -> int:
+    '''Summarize a game of bingo like play_and_summarize_game, drawing through a BingoHall.
+    '''
+    hall = BingoHall([player.card for player in game.players])
+    remaining = len(game.players)
+    for draw in game.draws:
+        winners = hall.draw(draw)
+        remaining -= len(winners)
+        if winners and not has_squid:
+            return hall.score(winners[0], draw)
+        if winners and remaining == 0:
+            return hall.score(winners[-1], draw)
+
+    return 0
+
+
 def parse_bingo_game(s: str) -> Game:
     '''Create an instance of a bingo game from a string.
     
@@ -108,6 +181,128 @@ def play_and_summarize_game(game: Game, has_squid: bool = False) -> int:
         return 0
 
 
+def stack_cards(game: Game) -> np.ndarray:
+    '''Stack the cards of every player into an (n, 5, 5) array.
+    '''
+    return np.array([player.card for player in game.players], dtype = np.int64).reshape(-1, 5, 5)
+
+
+def find_win_turns(cards: np.ndarray, draws: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    '''Find the turn every card wins on and its score at that point, all at once.
+
+    Each number on the cards is replaced by the turn it's first drawn on. A
+    line wins on the latest turn among its numbers, and a card on the
+    earliest turn among its lines. Cards that never win get len(draws) as
+    their turn and a score of 0.
+    '''
+    draws = np.asarray(draws, dtype = np.int64)
+    never = len(draws)
+    size = int(max(cards.max(initial = 0), draws.max(initial = 0))) + 1
+    # Assign in reverse so that numbers drawn twice keep their first turn
+    turn_of = np.full(size, never, dtype = np.int64)
+    turn_of[draws[::-1]] = np.arange(never - 1, -1, -1)
+
+    turns = turn_of[cards]
+    win_turns = np.minimum(turns.max(axis = 2).min(axis = 1), turns.max(axis = 1).min(axis = 1))
+
+    unmarked = np.where(turns > win_turns[:, None, None], cards, 0).sum(axis = (1, 2))
+    winning_draws = np.append(draws, 0)[win_turns]
+    return win_turns, unmarked * winning_draws
+
+
+def summarize_game_vectorized(game: Game, has_squid: bool = False) -> int:
+    '''Summarize a game of bingo like play_and_summarize_game, without playing it out.
+
+    The first winner is the card with the earliest win turn, or the first of
+    them on a tie. With the squid, every card has to win: the last winner is
+    the last card in the game to reach the latest win turn.
+    '''
+    if not game.players:
+        return 0
+
+    win_turns, scores = find_win_turns(stack_cards(game), game.draws)
+    if not has_squid:
+        return int(scores[np.argmin(win_turns)])
+
+    if win_turns.max() == len(game.draws):
+        return 0
+    return int(scores[len(win_turns) - 1 - np.argmax(win_turns[::-1])])
+
+
+@cached_parser()
+def read_bingo_game(input: str) -> Game:
+    '''Read a game of bingo from an input file.
+
+    The first record holds the draws and each record after it is a card.
+    '''
+    draws, *cards = records(input)
+    numbers = int_array(b'\n'.join(cards), stride = 5).reshape(len(cards), 5, 5)
+    return Game(int_array(draws).tolist(), [Player(card = c) for c in numbers.tolist()])
+
+
+def part_1(input: str) -> int:
+    '''Play the game of bingo in an input file and summarize the result.
+    '''
+    return summarize_game_vectorized(read_bingo_game(input))
+
+
+def part_2(input: str) -> int:
+    '''Play the game of bingo in an input file with the squid and summarize the result.
+    '''
+    return summarize_game_vectorized(read_bingo_game(input), has_squid = True)
+
+
+def score_card(card: List[List[int]], turns: Dict[int, int], draws: List[int]) -> Tuple[float, int]:
+    '''Find the turn a card wins on and its score at that point.
+
+    A line wins on the turn its last number is drawn, and a card wins with
+    its first winning line. Cards that never win get an infinite turn.
+    '''
+    never = float('inf')
+    card_turns = [[turns.get(n, never) for n in row] for row in card]
+    lines = card_turns + [list(col) for col in zip(*card_turns)]
+    win_turn = min(max(line) for line in lines)
+    if win_turn == never:
+        return never, 0
+
+    unmarked = sum(n for row, row_turns in zip(card, card_turns) for n, t in zip(row, row_turns) if t > win_turn)
+    return win_turn, unmarked * draws[win_turn]
+
+
+def solve_stream(lines: Iterable[str]) -> Tuple[int, int]:
+    '''Summarize the game with and without the squid in one pass over lines of a game.
+
+    The draws come first, so each card can be scored as soon as its rows have
+    been read, keeping only the first and last winners.
+    '''
+    lines = iter(lines)
+    header = next((line for line in lines if line.strip()), None)
+    if header is None:
+        return 0, 0
+    draws = [int(i) for i in header.split(',')]
+    # The first turn each number is drawn on
+    turns = {}
+    for turn, n in enumerate(draws):
+        turns.setdefault(n, turn)
+
+    first, last = (float('inf'), 0), (-1, 0)
+    card = []
+    for line in lines:
+        if line.strip():
+            card.append([int(i) for i in line.split()])
+        if len(card) == 5:
+            win_turn, score = score_card(card, turns, draws)
+            # Ties go to the card that comes first, or last for the squid.
+            # A card that never wins leaves the squid without a winner.
+            if win_turn < first[0]:
+                first = (win_turn, score)
+            if win_turn >= last[0]:
+                last = (win_turn, score)
+            card = []
+
+    return first[1], last[1]
+
+
 test_01 = '''7,4,9,5,11,17,23,2,0,14,21,24,10,16,13,6,15,25,12,22,18,20,8,19,3,26,1
 
 22 13 17 11  0
@@ -136,9 +331,12 @@ if __name__ == '__main__':
     # Test the example from the instructions
     assert play_and_summarize_game(parse_bingo_game(test_01)) == 4512, "Test 1 failed"
     assert play_and_summarize_game(parse_bingo_game(test_01), has_squid = True) == 1924, "Test 2 failed"
+    assert solve_stream(test_01.splitlines()) == (4512, 1924), "Stream test failed"
+    assert summarize_game_vectorized(parse_bingo_game(test_01)) == 4512, "Vectorized test 1 failed"
+    assert summarize_game_vectorized(parse_bingo_game(test_01), has_squid = True) == 1924, "Vectorized test 2 failed"
+    assert summarize_game_incremental(parse_bingo_game(test_01)) == 4512, "Incremental test 1 failed"
+    assert summarize_game_incremental(parse_bingo_game(test_01), has_squid = True) == 1924, "Incremental test 2 failed"
 
     # Run on input
-    with open(input, 'rt') as f:
-        game = parse_bingo_game(f.read())
-        print('Part 1:', play_and_summarize_game(game))
-        print('Part 2:', play_and_summarize_game(game, has_squid = True))
\ No newline at end of file
+    print('Part 1:', part_1(input))
+    print('Part 2:', part_2(input))
\ No newline at end of file
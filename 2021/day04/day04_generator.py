@@ -0,0 +1,22 @@
+'''Advent of Code 2021: Day 04 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate a bingo game: a line of draws followed by 5x5 cards separated
+    by blank lines.
+
+    Every number from 0 to 99 is drawn, so every card eventually wins. A scale
+    of 1 gives as many cards as the puzzle input (100).
+    '''
+    rng = random.Random(seed)
+    draws = rng.sample(range(100), 100)
+
+    cards = []
+    for _ in range(max(1, round(100 * scale))):
+        numbers = rng.sample(range(100), 25)
+        cards.append('\n'.join(' '.join(f'{n:>2}' for n in numbers[i:(i + 5)]) for i in range(0, 25, 5)))
+
+    return ','.join(str(d) for d in draws) + '\n\n' + '\n\n'.join(cards) + '\n'
@@ -1,22 +1,29 @@
-from collections import Counter
-from itertools import zip_longest
-from math import abs
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
+from itertools import combinations, zip_longest
 import re
-from typing import Generator, Iterable, List, Tuple
+from typing import Dict, Generator, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from aoc.cache import cached_parser
+from aoc.inputs import int_array, read_ints
 
 Point = Tuple[int, int]
 Line = Tuple[Point, Point]
+Interval = Tuple[int, int]
+
+LINE_SPEC = re.compile(r'^\s*(\d+),(\d+) -> (\d+),(\d+)\s*$')
 
 
 def parse_line_spec(line_spec: str) -> Tuple[Point]:
     '''Create a line (pair of points) from a string.
     '''
-    match = re.match('^(\d+)\,(\d+) \-> (\d+),(\d+)', line_spec)
-    
-    try:
-        x0, y0, x1, y1 = (int(i) for i in match.groups())
-    except (AttributeError, ValueError):
-         raise ValueError(f'Could not parse line from "{line_spec}".')
+    match = LINE_SPEC.match(line_spec)
+    if match is None:
+        raise ValueError(f'Could not parse line from "{line_spec}".')
+
+    x0, y0, x1, y1 = (int(i) for i in match.groups())
 
     return ((x0, y0), (x1, y1))
     
@@ -78,6 +85,277 @@ def find_intersections(lines: Iterable[Line], diagonal_allowed: bool = True) ->
     return [point for point, nlines in coverage.items() if nlines > 1]
 
 
+def valid_lines(coords: np.ndarray, diagonal_allowed: bool = True) -> np.ndarray:
+    '''Mark the valid lines among rows of x0, y0, x1, y1, as with is_valid_line.
+    '''
+    dx = coords[:, 2] - coords[:, 0]
+    dy = coords[:, 3] - coords[:, 1]
+    valid = (dx == 0) | (dy == 0)
+    if diagonal_allowed:
+        valid |= np.abs(dx) == np.abs(dy)
+    return valid
+
+
+def rasterize(coords: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    '''List the points on valid lines given as rows of x0, y0, x1, y1.
+
+    Returns the xs and ys of every point, line after line, as points_on_line
+    would.
+    '''
+    dx = coords[:, 2] - coords[:, 0]
+    dy = coords[:, 3] - coords[:, 1]
+    lengths = np.maximum(np.abs(dx), np.abs(dy)) + 1
+    # How far along its line each point is
+    starts = np.cumsum(lengths) - lengths
+    steps = np.arange(lengths.sum()) - np.repeat(starts, lengths)
+
+    xs = np.repeat(coords[:, 0], lengths) + np.repeat(np.sign(dx), lengths) * steps
+    ys = np.repeat(coords[:, 1], lengths) + np.repeat(np.sign(dy), lengths) * steps
+    return xs, ys
+
+
+def count_overlaps_dense(coords: np.ndarray,
+                         diagonal_allowed: bool = True,
+                         batch_points: int = 2**24) -> int:
+    '''Count the points where at least two lines intersect, by drawing the
+    lines on a grid covering them all.
+
+    Lines are drawn in batches of about batch_points points, so only the
+    grid has to fit in memory. Each cell counts the lines through it, capped
+    at 2 after every batch so it can't overflow. Grids no bigger than a
+    batch are counted with bincount, which needs a full-size array of
+    counts; for bigger ones only the cells a batch touches are counted, with
+    unique, and added into the grid.
+    '''
+    coords = np.asarray(coords, dtype = np.int64).reshape(-1, 4)
+    coords = coords[valid_lines(coords, diagonal_allowed)]
+    if not len(coords):
+        return 0
+
+    x_min, y_min = coords[:, 0::2].min(), coords[:, 1::2].min()
+    width = coords[:, 0::2].max() - x_min + 1
+    height = coords[:, 1::2].max() - y_min + 1
+    coverage = np.zeros(height * width, dtype = np.uint16)
+
+    lengths = np.maximum(np.abs(coords[:, 2] - coords[:, 0]), np.abs(coords[:, 3] - coords[:, 1])) + 1
+    ends = np.cumsum(lengths)
+    start = 0
+    while start < len(coords):
+        # At least one line, however long
+        end = int(np.searchsorted(ends, ends[start] - lengths[start] + batch_points, side = 'right'))
+        end = max(end, start + 1)
+        xs, ys = rasterize(coords[start:end])
+        cells = (ys - y_min) * width + (xs - x_min)
+        if len(coverage) <= batch_points:
+            coverage += np.minimum(np.bincount(cells, minlength = len(coverage)), 2).astype(np.uint16)
+        else:
+            touched, counts = np.unique(cells, return_counts = True)
+            coverage[touched] += np.minimum(counts, 2).astype(np.uint16)
+        np.minimum(coverage, 2, out = coverage)
+        start = end
+
+    return int(np.count_nonzero(coverage >= 2))
+
+
+# The orientations of valid lines: horizontal, vertical, and the two
+# diagonals. A line of each orientation is found by a key that is the same
+# at all its points, and a position along it.
+ORIENTATIONS = ('horizontal', 'vertical', 'rising', 'falling')
+
+
+def to_key(orientation: str, point: Point) -> Tuple[int, int]:
+    '''The key and position of a point on a line of some orientation.
+    '''
+    x, y = point
+    if orientation == 'horizontal':
+        return y, x
+    elif orientation == 'vertical':
+        return x, y
+    elif orientation == 'rising':
+        return y - x, x
+    else:
+        return x + y, x
+
+
+def from_key(orientation: str, key: int, position: int) -> Point:
+    '''The point at a position on the line of some orientation with a key.
+    '''
+    if orientation == 'horizontal':
+        return position, key
+    elif orientation == 'vertical':
+        return key, position
+    elif orientation == 'rising':
+        return position, key + position
+    else:
+        return position, key - position
+
+
+def find_orientation(line: Line, diagonal_allowed: bool = True) -> Optional[str]:
+    '''Find the orientation of a line, or None if it isn't valid. Single points count as horizontal.
+    '''
+    (x0, y0), (x1, y1) = line
+    dx, dy = x1 - x0, y1 - y0
+    if dy == 0:
+        return 'horizontal'
+    elif dx == 0:
+        return 'vertical'
+    elif diagonal_allowed and dx == dy:
+        return 'rising'
+    elif diagonal_allowed and dx == -dy:
+        return 'falling'
+    return None
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> Tuple[List[Interval], List[Interval]]:
+    '''Merge closed intervals, finding where they cover at least once and at least twice.
+
+    Returns both as sorted lists of disjoint intervals.
+    '''
+    once, twice = [], []
+    for start, end in sorted(intervals):
+        if once and start <= once[-1][1]:
+            overlap = (start, min(end, once[-1][1]))
+            if twice and overlap[0] <= twice[-1][1]:
+                twice[-1] = (twice[-1][0], max(twice[-1][1], overlap[1]))
+            else:
+                twice.append(overlap)
+            once[-1] = (once[-1][0], max(once[-1][1], end))
+        else:
+            once.append((start, end))
+
+    return once, twice
+
+
+def find_crossings(horizontals: Iterable[Tuple[int, int, int]],
+                   verticals: Iterable[Tuple[int, int, int]]) -> Iterator[Point]:
+    '''Find where horizontal segments (v, u0, u1) cross vertical segments (u, v0, v1).
+
+    Sweeps across u, keeping the vs of the horizontal segments spanning it
+    sorted, so each vertical segment finds the ones it crosses by bisection.
+    Horizontal segments with the same v must not overlap. Yields (u, v).
+    '''
+    # Segments start before, and end after, the crossings at the same u
+    events = [(u0, 0, v, v) for v, u0, u1 in horizontals]
+    events += [(u1, 2, v, v) for v, u0, u1 in horizontals]
+    events += [(u, 1, v0, v1) for u, v0, v1 in verticals]
+    events.sort()
+
+    active = []
+    for u, kind, v0, v1 in events:
+        if kind == 0:
+            insort(active, v0)
+        elif kind == 2:
+            del active[bisect_left(active, v0)]
+        else:
+            for v in active[bisect_left(active, v0):bisect_right(active, v1)]:
+                yield u, v
+
+
+def count_overlaps_analytic(lines: Iterable[Line], diagonal_allowed: bool = True) -> int:
+    '''Count the points where at least two lines intersect, without visiting the points lines cover.
+
+    Lines of the same orientation and key are merged as intervals, so
+    points they cover twice are counted by length. Points where lines of
+    different orientations cross are found with a sweep line. Memory grows
+    with the number of lines and crossings, whatever the range of the
+    coordinates.
+
+    The answer is every crossing, plus every point covered twice by one
+    orientation that isn't also a crossing.
+    '''
+    intervals = {o: defaultdict(list) for o in ORIENTATIONS}
+    for line in lines:
+        orientation = find_orientation(line, diagonal_allowed)
+        if orientation is not None:
+            key, start = to_key(orientation, line[0])
+            _, end = to_key(orientation, line[1])
+            intervals[orientation][key].append((min(start, end), max(start, end)))
+
+    covered: Dict[str, Dict[int, List[Interval]]] = {}
+    doubled: Dict[str, Dict[int, List[Interval]]] = {}
+    for orientation in ORIENTATIONS:
+        covered[orientation], doubled[orientation] = {}, {}
+        for key, key_intervals in intervals[orientation].items():
+            covered[orientation][key], doubled[orientation][key] = merge_intervals(key_intervals)
+
+    crossings = set()
+    for across, down in combinations(ORIENTATIONS, 2):
+        # Sweep with u as the key of the down lines and v as the key of the
+        # across lines. Along an across line, u changes by step per position.
+        offset = to_key(down, from_key(across, 0, 0))[0]
+        step = to_key(down, from_key(across, 0, 1))[0] - offset
+
+        horizontals, verticals = [], []
+        for key, segments in covered[across].items():
+            base = to_key(down, from_key(across, key, 0))[0]
+            for start, end in segments:
+                u0, u1 = base + step * start, base + step * end
+                horizontals.append((key, min(u0, u1), max(u0, u1)))
+        for key, segments in covered[down].items():
+            for start, end in segments:
+                v0 = to_key(across, from_key(down, key, start))[0]
+                v1 = to_key(across, from_key(down, key, end))[0]
+                verticals.append((key, min(v0, v1), max(v0, v1)))
+
+        for u, v in find_crossings(horizontals, verticals):
+            # Diagonals can cross between points
+            position, remainder = divmod(u - to_key(down, from_key(across, v, 0))[0], step)
+            if remainder == 0:
+                crossings.add(from_key(across, v, position))
+
+    total = len(crossings)
+    for orientation in ORIENTATIONS:
+        starts = {key: [start for start, _ in segments] for key, segments in doubled[orientation].items()}
+        total += sum(end - start + 1 for segments in doubled[orientation].values() for start, end in segments)
+        for point in crossings:
+            key, position = to_key(orientation, point)
+            segments = doubled[orientation].get(key)
+            if segments:
+                i = bisect_right(starts[key], position) - 1
+                total -= i >= 0 and position <= segments[i][1]
+
+    return total
+
+
+@cached_parser()
+def read_line_coords(input: str) -> np.ndarray:
+    '''Read the lines from an input file as rows of x0, y0, x1, y1.
+    '''
+    return read_ints(input, stride = 4, negative = False)
+
+
+def part_1(input: str) -> int:
+    '''Count the intersections of horizontal and vertical lines in an input file.
+    '''
+    return count_overlaps_dense(read_line_coords(input), diagonal_allowed = False)
+
+
+def part_2(input: str) -> int:
+    '''Count the intersections of all the lines in an input file.
+    '''
+    return count_overlaps_dense(read_line_coords(input), diagonal_allowed = True)
+
+
+def solve_stream(lines: Iterable[str]) -> Tuple[int, int]:
+    '''Count the intersections with and without diagonal lines in one pass over lines of line specs.
+
+    Memory grows with the number of points covered, not of lines read.
+    '''
+    straight_coverage, coverage = Counter(), Counter()
+    for line_spec in lines:
+        if not line_spec.strip():
+            continue
+        line = parse_line_spec(line_spec)
+        if is_valid_line(line, diagonal_allowed = True):
+            points = points_on_line(line, diagonal_allowed = True)
+            coverage.update(points)
+            if is_valid_line(line, diagonal_allowed = False):
+                straight_coverage.update(points)
+
+    return (sum(1 for n in straight_coverage.values() if n > 1),
+            sum(1 for n in coverage.values() if n > 1))
+
+
 # Example from the instructions
 test_01 = '''0,9 -> 5,9
 8,0 -> 0,8
@@ -97,9 +375,12 @@ if __name__ == '__main__':
     # Test example from the instructions
     assert len(find_intersections((parse_line_spec(row.strip()) for row in test_01.splitlines()), diagonal_allowed = False)) == 5, "Test 1 failed"
     assert len(find_intersections((parse_line_spec(row.strip()) for row in test_01.splitlines()), diagonal_allowed = True)) == 12, "Test 2 failed"
+    assert solve_stream(test_01.splitlines()) == (5, 12), "Stream test failed"
+    assert count_overlaps_dense(int_array(test_01.encode()), diagonal_allowed = False) == 5, "Dense test 1 failed"
+    assert count_overlaps_dense(int_array(test_01.encode()), diagonal_allowed = True) == 12, "Dense test 2 failed"
+    assert count_overlaps_analytic((parse_line_spec(row) for row in test_01.splitlines()), diagonal_allowed = False) == 5, "Analytic test 1 failed"
+    assert count_overlaps_analytic((parse_line_spec(row) for row in test_01.splitlines()), diagonal_allowed = True) == 12, "Analytic test 2 failed"
 
     # Run on the input
-    with open(input, 'rt') as f:
-        lines = [parse_line_spec(row.strip()) for row in f]
-        print("Part 1:", len(find_intersections(lines, diagonal_allowed = False)))
-        print("Part 2:", len(find_intersections(lines, diagonal_allowed = True)))
+    print("Part 1:", part_1(input))
+    print("Part 2:", part_2(input))
@@ -0,0 +1,24 @@
+'''Advent of Code 2021: Day 05 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0, extent: int = 1000) -> str:
+    '''Generate vent lines, e.g. "0,9 -> 5,9".
+
+    Lines are horizontal, vertical or 45º and lie within an extent x extent
+    plane. A scale of 1 gives as many lines as the puzzle input (500).
+    '''
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(max(1, round(500 * scale))):
+        x0, y0 = rng.randrange(extent), rng.randrange(extent)
+        dx, dy = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)])
+        # Longest the line can be without leaving the plane
+        max_len = min(x0 if dx < 0 else extent - 1 - x0 if dx > 0 else extent,
+                      y0 if dy < 0 else extent - 1 - y0 if dy > 0 else extent)
+        n = rng.randint(0, max_len)
+        lines.append(f'{x0},{y0} -> {x0 + dx * n},{y0 + dy * n}\n')
+
+    return ''.join(lines)
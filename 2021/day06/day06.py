@@ -1,8 +1,21 @@
 from collections import Counter, defaultdict
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from aoc.cache import cached_parser
+from aoc.inputs import count_values, int_array, read_ints
 
 # A school of lanternfish
 School = Dict[int, int]
+Matrix = Tuple[Tuple[int, ...], ...]
+
+# How a day changes the number of fish of each age: the fish aged a + 1 are
+# aged a tomorrow, and the fish aged 0 are aged 6 and have a fish aged 8.
+TRANSITION: Matrix = tuple(
+    tuple(int(to == since - 1 or (since == 0 and to in (6, 8))) for since in range(9))
+    for to in range(9))
 
 
 def next_day_school(school: School) -> School:
@@ -35,10 +48,131 @@ def count_fish(school: School) -> int:
     '''
     return sum(school.values())
 
+
+def multiply(a: Matrix, b: Matrix, modulus: Optional[int] = None) -> Matrix:
+    '''Multiply two square matrices exactly, or modulo a modulus.
+    '''
+    columns = list(zip(*b))
+    product = tuple(tuple(sum(x * y for x, y in zip(row, col)) for col in columns) for row in a)
+    if modulus is not None:
+        product = tuple(tuple(x % modulus for x in row) for row in product)
+    return product
+
+
+@lru_cache(maxsize = None)
+def transition_power(k: int, modulus: Optional[int] = None) -> Matrix:
+    '''The transition over 2**k days, by repeated squaring.
+
+    Powers are cached, so advancing any number of schools by any number of
+    days reuses the squarings done before.
+    '''
+    if k == 0:
+        return TRANSITION
+    half = transition_power(k - 1, modulus)
+    return multiply(half, half, modulus)
+
+
+def advance_school(ndays: int, school: School, modulus: Optional[int] = None) -> School:
+    '''Update a school of fish over a number of days, in steps of powers of 2 days.
+
+    Takes a number of steps in the log of ndays, but that only makes it
+    quick when counts are taken modulo a modulus. Exact counts grow about
+    1.09 times a day, a digit every 26 days or so, so for 10**12 days they
+    would have tens of billions of digits: without a modulus, the cost of
+    multiplying big numbers sets the time, and a million days already takes
+    about a second.
+    '''
+    counts = [school.get(age, 0) for age in range(9)]
+    k = 0
+    while ndays >> k:
+        if ndays >> k & 1:
+            counts = [sum(x * n for x, n in zip(row, counts)) for row in transition_power(k, modulus)]
+            if modulus is not None:
+                counts = [n % modulus for n in counts]
+        k += 1
+
+    return dict(enumerate(counts))
+
+
+def count_fish_after(horizons: Iterable[int],
+                     schools: Iterable[School],
+                     modulus: Optional[int] = None) -> List[List[int]]:
+    '''Count the fish in every school after every number of days.
+
+    Returns a row of counts per school, one for each horizon.
+    '''
+    horizons = list(horizons)
+    counts = []
+    for school in schools:
+        row = [count_fish(advance_school(ndays, school, modulus)) for ndays in horizons]
+        counts.append([n % modulus for n in row] if modulus is not None else row)
+
+    return counts
+
+
+def simulate_schools(ndays: int, schools: Iterable[School], dtype = np.int64) -> np.ndarray:
+    '''Follow the number of fish in many schools day by day, all at once.
+
+    The schools are the rows of an array of counts by age, used as a ring
+    buffer: the column of fish aged 0 moves along by one each day, and
+    becomes the column of newborn fish aged 8, so a day only adds the fish
+    giving birth to the column aged 6. Returns an array of shape
+    (schools, ndays + 1) with the total fish in each school on each day.
+
+    Counts overflow int64 after about 400 days. Pass dtype = object for
+    exact counts past that, at a slower pace.
+    '''
+    counts = np.array([[school.get(age, 0) for age in range(9)] for school in schools], dtype = dtype).reshape(-1, 9)
+    totals = np.empty((len(counts), ndays + 1), dtype = dtype)
+    totals[:, 0] = counts.sum(axis = 1)
+
+    for day in range(ndays):
+        zero = day % 9
+        births = counts[:, zero]
+        counts[:, (zero + 7) % 9] += births
+        totals[:, day + 1] = totals[:, day] + births
+
+    return totals
+
+
 def parse_school(s: str) -> School:
     '''Create a school of lanternfish from a string.
     '''
-    return Counter(int(i) for i in s.strip().split(','))
+    return count_values(int_array(s.encode()))
+
+
+@cached_parser()
+def read_school(input: str) -> School:
+    '''Read a school of lanternfish from an input file.
+    '''
+    return count_values(read_ints(input))
+
+
+def part_1(input: str) -> int:
+    '''Count the fish after 80 days in a school from an input file.
+    '''
+    return count_fish(advance_school(80, read_school(input)))
+
+
+def part_2(input: str) -> int:
+    '''Count the fish after 256 days in a school from an input file.
+    '''
+    return count_fish(advance_school(256, read_school(input)))
+
+
+def solve_stream(lines: Iterable[str]) -> Tuple[int, int]:
+    '''Count the fish after 80 and 256 days in one pass over lines of ages.
+
+    Only the count of fish of each age is kept, and the 256 day count carries
+    on from the 80 day one.
+    '''
+    school = Counter()
+    for line in lines:
+        school.update(int(i) for i in line.split(',') if i.strip())
+
+    after_80 = update_school(80, school)
+    return count_fish(after_80), count_fish(update_school(256 - 80, after_80))
+
 
 # Example from the instructions
 test_01 = "3,4,3,1,2"
@@ -49,9 +183,10 @@ if __name__ == '__main__':
     # Test the example from the instructions
     assert count_fish(update_school(80, parse_school(test_01))) == 5934, "Test 1 failed"
     assert count_fish(update_school(256, parse_school(test_01))) == 26984457539, "Test 2 failed"
+    assert solve_stream([test_01]) == (5934, 26984457539), "Stream test failed"
+    assert count_fish_after([80, 256], [parse_school(test_01)]) == [[5934, 26984457539]], "Matrix test failed"
+    assert simulate_schools(256, [parse_school(test_01)])[0, [18, 80, 256]].tolist() == [26, 5934, 26984457539], "Simulation test failed"
 
     # Run on the input
-    with open(input, 'rt') as f:
-        school = parse_school(f.read())
-        print('Part 1:', count_fish(update_school(80, school)))
-        print('Part 2:', count_fish(update_school(256, school)))
+    print('Part 1:', part_1(input))
+    print('Part 2:', part_2(input))
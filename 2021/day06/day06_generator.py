@@ -0,0 +1,13 @@
+'''Advent of Code 2021: Day 06 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate a school of lanternfish as a comma separated list of timers.
+
+    A scale of 1 gives as many fish as the puzzle input (300).
+    '''
+    rng = random.Random(seed)
+    return ','.join(str(rng.randint(1, 5)) for _ in range(max(1, round(300 * scale)))) + '\n'
@@ -1,12 +1,25 @@
 from  collections import Counter
-from math import abs
-from queue import PriorityQueue
+from functools import lru_cache
+import math
+from typing import Callable, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from aoc.cache import cached_parser
+from aoc.inputs import count_values, int_array, read_ints
+
+# The cost for one crab of moving a signed number of steps (position - crab),
+# over arrays of steps
+StepCost = Callable[[np.ndarray], np.ndarray]
+
+# The golden ratio's inverse, for golden section search
+INVERSE_PHI = (math.sqrt(5) - 1) / 2
 
 
 def parse_crabs(s: str):
     '''Count how many crabs in each position.
       '''
-    return Counter(int(i) for i in  s.strip().split(','))
+    return count_values(int_array(s.encode()))
 
 
 def linear_cost(crabs, pos):
@@ -25,11 +38,216 @@ def find_best_position(crabs, cost_fn):
     '''Given a cost function, find the lowest total cost position to 
     move all the crabs to.
     '''
-    costs = PriorityQueue()
-    for pos in range(max(crabs.keys())):
-        costs.put((cost_fn(crabs, pos), pos))
+    return min((cost_fn(crabs, pos), pos) for pos in range(max(crabs.keys())))
+
+
+def weighted_median(crabs) -> int:
+    '''Find the lowest position with at least half the crabs at or before it.
+    '''
+    total = sum(crabs.values())
+    seen = 0
+    for pos in sorted(crabs):
+        seen += crabs[pos]
+        if 2 * seen >= total:
+            return pos
+
+
+def find_best_linear_position(crabs) -> Tuple[int, int]:
+    '''Find the lowest cost position when each step costs one unit.
+
+    Moving away from the median moves away from at least as many crabs as
+    it moves towards, so the (lowest) median is the best position.
+    '''
+    pos = weighted_median(crabs)
+    return linear_cost(crabs, pos), pos
+
 
-    return costs.get(0)
+def find_best_increasing_position(crabs) -> Tuple[int, int]:
+    '''Find the lowest cost position when the cost of each step increases.
+
+    The cost is half the sum of squared distances, which is lowest at the
+    mean, plus half the sum of distances, which moves the best position by
+    at most half a step. Only the positions around the mean are checked.
+    '''
+    mean = sum(k * v for k, v in crabs.items()) / sum(crabs.values())
+    return min((increasing_cost(crabs, pos), pos) for pos in range(math.floor(mean) - 1, math.ceil(mean) + 2))
+
+
+class CostCurves(NamedTuple):
+    positions: np.ndarray
+    linear: np.ndarray
+    increasing: np.ndarray
+
+
+def find_cost_curves(crabs) -> CostCurves:
+    '''Find the cost of aligning the crabs at every position between the
+    first and the last, under both cost functions.
+
+    Prefix sums of the crabs and their positions give the linear cost at
+    every position at once. They also give how much the increasing cost
+    changes from one position to the next: each crab at or before the
+    position gets one step further away, and each crab after it one step
+    closer. Takes time in the number of positions plus crabs. Costs must
+    fit in an int64.
+    '''
+    lo, hi = min(crabs), max(crabs)
+    positions = np.arange(lo, hi + 1, dtype = np.int64)
+    counts = np.zeros(len(positions), dtype = np.int64)
+    counts[np.fromiter(crabs.keys(), dtype = np.int64) - lo] = np.fromiter(crabs.values(), dtype = np.int64)
+
+    # Crabs at or before each position, and the sum of their positions
+    count_before = np.cumsum(counts)
+    sum_before = np.cumsum(counts * positions)
+    total_count, total_sum = count_before[-1], sum_before[-1]
+    count_after, sum_after = total_count - count_before, total_sum - sum_before
+
+    linear = (positions * count_before - sum_before) + (sum_after - positions * count_after)
+    # The cost of moving from each position to the next
+    steps = ((positions + 1) * count_before - sum_before) - (sum_after - positions * count_after)
+    increasing = np.empty_like(linear)
+    increasing[0] = increasing_cost(crabs, lo)
+    np.cumsum(steps[:-1], out = increasing[1:])
+    increasing[1:] += increasing[0]
+    return CostCurves(positions, linear, increasing)
+
+
+def linear_steps(steps: np.ndarray) -> np.ndarray:
+    '''Each step costs one unit.
+    '''
+    return np.abs(steps)
+
+
+def increasing_steps(steps: np.ndarray) -> np.ndarray:
+    '''Each step costs one unit more than the one before.
+    '''
+    n = np.abs(steps)
+    return n * (n + 1) // 2
+
+
+def quadratic_steps(steps: np.ndarray) -> np.ndarray:
+    '''Moving costs the square of the number of steps.
+    '''
+    return steps * steps
+
+
+def capped_steps(cap: int) -> StepCost:
+    '''Each step costs one unit, up to a cap. Not convex.
+    '''
+    return lambda steps: np.minimum(np.abs(steps), cap)
+
+
+def asymmetric_steps(left: float, right: float) -> StepCost:
+    '''Steps to the left and to the right cost different amounts.
+    '''
+    return lambda steps: np.where(steps < 0, -steps * left, steps * right)
+
+
+def is_convex(step_cost: StepCost, span: int) -> bool:
+    '''Check whether a step cost is convex over moves of up to span steps either way.
+
+    The total cost is a sum of shifted step costs, so it's convex whenever
+    the step cost is.
+    '''
+    costs = step_cost(np.arange(-span - 1, span + 2))
+    return bool((costs[:-2] + costs[2:] >= 2 * costs[1:-1]).all())
+
+
+def golden_section_search(cost: Callable[[int], float], lo: int, hi: int) -> Tuple[float, int]:
+    '''Find the lowest cost position between lo and hi (inclusive) of a convex cost.
+
+    Each step compares the costs at two inner points and drops the part of
+    the range beyond the higher one, keeping about 62% of it. The inner
+    points are placed so that one of them is (usually) an inner point of the
+    next step too, so memoizing the cost saves an evaluation. The lowest
+    position wins ties.
+    '''
+    while hi - lo > 3:
+        gap = round((hi - lo) * INVERSE_PHI)
+        left, right = hi - gap, lo + gap
+        if left >= right:
+            left, right = (lo + hi) // 2, (lo + hi) // 2 + 1
+        # For a convex cost, the lowest minimum is before the higher point
+        if cost(left) <= cost(right):
+            hi = right - 1
+        else:
+            lo = left + 1
+
+    return min((cost(pos), pos) for pos in range(lo, hi + 1))
+
+
+def optimize_position(crabs,
+                      step_cost: StepCost,
+                      convex: Optional[bool] = None,
+                      chunk_size: int = 2**20) -> Tuple[float, int]:
+    '''Find the lowest cost position to move all the crabs to, for any step cost.
+
+    The step cost should be lowest for no steps and never lower further
+    away, so that the best position lies between the first and last crab.
+    Convexity is checked unless declared. Convex costs are minimized by
+    golden section search, evaluating the (memoized) total cost at a few
+    positions. Otherwise every position is evaluated with NumPy, a chunk of
+    positions by every crab at a time.
+    '''
+    keys = np.fromiter(crabs.keys(), dtype = np.int64)
+    counts = np.fromiter(crabs.values(), dtype = np.int64)
+    lo, hi = int(keys.min()), int(keys.max())
+    if convex is None:
+        convex = is_convex(step_cost, hi - lo)
+
+    if convex:
+        @lru_cache(maxsize = None)
+        def cost(pos: int) -> float:
+            return (step_cost(pos - keys) * counts).sum().item()
+
+        return golden_section_search(cost, lo, hi)
+
+    best = None
+    rows = max(chunk_size // len(keys), 1)
+    for start in range(lo, hi + 1, rows):
+        positions = np.arange(start, min(start + rows, hi + 1))
+        costs = step_cost(positions[:, None] - keys[None, :]) @ counts
+        i = int(np.argmin(costs))
+        if best is None or costs[i] < best[0]:
+            best = (costs[i].item(), int(positions[i]))
+
+    return best
+
+
+@cached_parser()
+def read_crabs(input: str):
+    '''Count how many crabs in each position from an input file.
+    '''
+    return count_values(read_ints(input))
+
+
+def part_1(input: str) -> int:
+    '''Find the lowest cost of aligning the crabs in an input file when each step costs one unit.
+    '''
+    cost, _ = find_best_linear_position(read_crabs(input))
+    return cost
+
+
+def part_2(input: str) -> int:
+    '''Find the lowest cost of aligning the crabs in an input file when the cost of each step increases.
+    '''
+    cost, _ = find_best_increasing_position(read_crabs(input))
+    return cost
+
+
+def solve_stream(lines: Iterable[str]) -> Tuple[int, int]:
+    '''Find the lowest costs of aligning the crabs under both cost functions in one pass over lines of positions.
+
+    Only the number of crabs at each position is kept.
+    '''
+    crabs = Counter()
+    for line in lines:
+        crabs.update(int(i) for i in line.split(',') if i.strip())
+
+    if not crabs:
+        return 0, 0
+    linear, _ = find_best_linear_position(crabs)
+    increasing, _ = find_best_increasing_position(crabs)
+    return linear, increasing
 
 
 # Example from the instructions
@@ -42,9 +260,14 @@ if __name__ == '__main__':
     # Test example from instructions
     assert find_best_position(parse_crabs(test_01), linear_cost) == (37, 2), "Test 1 failed"
     assert find_best_position(parse_crabs(test_01), increasing_cost) == (168, 5), "Test 2 failed"
+    assert solve_stream([test_01]) == (37, 168), "Stream test failed"
+    assert find_best_linear_position(parse_crabs(test_01)) == (37, 2), "Median test failed"
+    assert find_best_increasing_position(parse_crabs(test_01)) == (168, 5), "Mean test failed"
+    assert find_cost_curves(parse_crabs(test_01)).increasing[5] == 168, "Curve test failed"
+    assert optimize_position(parse_crabs(test_01), linear_steps) == (37, 2), "Optimizer test 1 failed"
+    assert optimize_position(parse_crabs(test_01), increasing_steps) == (168, 5), "Optimizer test 2 failed"
+    assert optimize_position(parse_crabs(test_01), increasing_steps, convex = False) == (168, 5), "Optimizer test 3 failed"
 
-with open(input, 'rt') as f:
-    crabs = parse_crabs(f.read())
-    
-    print('Part 1:', find_best_position(crabs, linear_cost))
-    print('Part 2:', find_best_position(crabs, increasing_cost))
+    # Run on input
+    print('Part 1:', part_1(input))
+    print('Part 2:', part_2(input))
@@ -0,0 +1,15 @@
+'''Advent of Code 2021: Day 07 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0, max_position: int = 2000) -> str:
+    '''Generate crab positions as a comma separated list.
+
+    Positions cluster towards zero, as in the puzzle input, and are capped at
+    max_position. A scale of 1 gives as many crabs as the puzzle input (1,000).
+    '''
+    rng = random.Random(seed)
+    positions = (min(max_position, int(rng.expovariate(1 / 400))) for _ in range(max(1, round(1000 * scale))))
+    return ','.join(str(p) for p in positions) + '\n'
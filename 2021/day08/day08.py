@@ -1,3 +1,33 @@
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from aoc.cache import cached_parser
+from aoc.inputs import Buffer, mapped
+
+# The segments lit for each digit, in order
+DIGIT_SEGMENTS = ('abcefg', 'cf', 'acdeg', 'acdfg', 'bcdf', 'abdfg', 'abdefg', 'acf', 'abcdefg', 'abcdfg')
+
+
+def to_mask(pattern: str) -> int:
+    '''Encode a pattern of segments as a 7-bit mask, a in the lowest bit.
+    '''
+    mask = 0
+    for seg in pattern.strip():
+        mask |= 1 << (ord(seg) - ord('a'))
+    return mask
+
+
+# How many of the ten digits light each segment. Whatever the wiring, the
+# frequencies of a digit's segments add up to a different signature for
+# every digit.
+SEGMENT_FREQUENCIES = [sum(seg in segments for segments in DIGIT_SEGMENTS) for seg in 'abcdefg']
+SIGNATURES = np.full(8 * 10, -1)
+for digit, segments in enumerate(DIGIT_SEGMENTS):
+    SIGNATURES[sum(SEGMENT_FREQUENCIES[ord(seg) - ord('a')] for seg in segments)] = digit
+
+BITS = np.arange(7, dtype = np.uint8)
+EASY_LENGTHS = (2, 3, 4, 7)
 
 
 def parse_entry(entry: str):
@@ -43,8 +73,87 @@ def decode(patterns, output):
     decoder = {frozenset(segs): str(digit) for digit, segs in decoded_digits.items()}
     return int(''.join(decoder[o] for o in output))
 
+def decode_masks(patterns: List[int], outputs: List[int]) -> int:
+    '''Decode an entry whose patterns are encoded as masks.
+
+    Each output digit is identified by its signature: the sum, over its
+    segments, of how many of the patterns light that segment.
+    '''
+    frequencies = [sum(p >> bit & 1 for p in patterns) for bit in range(7)]
+    value = 0
+    for output in outputs:
+        signature = sum(f for bit, f in enumerate(frequencies) if output >> bit & 1)
+        value = 10 * value + int(SIGNATURES[signature])
+    return value
+
+
+def parse_entry_masks(buf: Buffer) -> np.ndarray:
+    '''Parse lines of entries into an (n, 14) array of masks: the ten
+    patterns, then the four outputs.
+    '''
+    data = np.frombuffer(buf, dtype = np.uint8)
+    is_segment = (data >= ord('a')) & (data <= ord('g'))
+    starts = is_segment & ~np.concatenate([[False], is_segment[:-1]])
+    words = np.cumsum(starts)[is_segment] - 1
+    bits = np.left_shift(1, data[is_segment] - ord('a'))
+    masks = np.bincount(words, weights = bits, minlength = int(starts.sum())).astype(np.uint8)
+    if len(masks) % 14:
+        raise ValueError('Every entry must have ten patterns and four outputs.')
+    return masks.reshape(-1, 14)
+
+
+def decode_entries(masks: np.ndarray) -> np.ndarray:
+    '''Decode the outputs of every entry at once, as decode_masks does for one.
+    '''
+    lit = (masks[:, :, None] >> BITS) & 1
+    frequencies = lit[:, :10].sum(axis = 1)
+    signatures = (lit[:, 10:] * frequencies[:, None, :]).sum(axis = 2)
+    return SIGNATURES[signatures] @ np.array([1000, 100, 10, 1])
+
+
+def count_easy_outputs(masks: np.ndarray) -> int:
+    '''Count the outputs of every entry that light a unique number of segments.
+    '''
+    nlit = ((masks[:, 10:, None] >> BITS) & 1).sum(axis = 2)
+    return int(np.isin(nlit, EASY_LENGTHS).sum())
+
+
 def count_easy_digits(digits):
     return len([d for d in digits if len(d) in (2, 3, 4, 7)])
+
+
+@cached_parser()
+def read_entry_masks(input: str) -> np.ndarray:
+    '''Read the display entries from an input file as masks.
+    '''
+    with mapped(input) as buf:
+        return parse_entry_masks(buf)
+
+
+def part_1(input: str) -> int:
+    '''Count the easy digits in the outputs of the entries in an input file.
+    '''
+    return count_easy_outputs(read_entry_masks(input))
+
+
+def part_2(input: str) -> int:
+    '''Decode and sum the outputs of the entries in an input file.
+    '''
+    return int(decode_entries(read_entry_masks(input)).sum())
+
+
+def solve_stream(lines: Iterable[str]) -> Tuple[int, int]:
+    '''Count the easy digits and sum the decoded outputs in one pass over lines of entries.
+    '''
+    easy_digits, total = 0, 0
+    for line in lines:
+        if line.strip():
+            patterns, outputs = line.split('|')
+            outputs = [to_mask(o) for o in outputs.split()]
+            easy_digits += sum(bin(o).count('1') in EASY_LENGTHS for o in outputs)
+            total += decode_masks([to_mask(p) for p in patterns.split()], outputs)
+
+    return easy_digits, total
     
 
 test_01 = '''be cfbegad cbdgef fgaecd cgeb fdcge agebfd fecdb fabcd edb | fdgacbe cefdb cefbgd gcbe
@@ -67,7 +176,11 @@ if __name__ == '__main__':
 
     assert sum(decode(*parse_entry(row)) for row in test_01.splitlines()) == 61229, "Test 2 failed."
 
-    with open(input, 'rt') as f:
-        entries = [parse_entry(row) for row in f]
-        print(sum(count_easy_digits(o) for _, o in entries))
-        print(sum(decode(*e) for e in entries))
+    assert solve_stream(test_01.splitlines()) == (26, 61229), "Stream test failed."
+
+    assert count_easy_outputs(parse_entry_masks(test_01.encode())) == 26, "Mask test 1 failed."
+
+    assert decode_entries(parse_entry_masks(test_01.encode())).sum() == 61229, "Mask test 2 failed."
+
+    print(part_1(input))
+    print(part_2(input))
@@ -0,0 +1,31 @@
+'''Advent of Code 2021: Day 08 input generator
+'''
+
+import random
+
+# Segments lit for each digit on a correctly wired display
+DIGIT_SEGMENTS = ['abcefg', 'cf', 'acdeg', 'acdfg', 'bcdf', 'abdfg', 'abdefg', 'acf', 'abcdefg', 'abcdfg']
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate display entries: ten unique signal patterns, a "|" and four output values.
+
+    Each entry has its own random wiring of segments, and the letters of each
+    pattern are shuffled. A scale of 1 gives as many entries as the puzzle
+    input (200).
+    '''
+    rng = random.Random(seed)
+
+    def scramble(segments, wiring):
+        scrambled = [wiring[s] for s in segments]
+        rng.shuffle(scrambled)
+        return ''.join(scrambled)
+
+    entries = []
+    for _ in range(max(1, round(200 * scale))):
+        wiring = dict(zip('abcdefg', rng.sample('abcdefg', 7)))
+        patterns = [scramble(s, wiring) for s in rng.sample(DIGIT_SEGMENTS, 10)]
+        outputs = [scramble(rng.choice(DIGIT_SEGMENTS), wiring) for _ in range(4)]
+        entries.append(f'{" ".join(patterns)} | {" ".join(outputs)}\n')
+
+    return ''.join(entries)
@@ -1,20 +1,39 @@
+import heapq
+from itertools import chain
+
+from aoc.inputs import int_array, records
+
+
 
 def sum_calories_per_elf(fpath):
-	n = 0
-	cals_i = 0
-	cal_lst = []
-	with open(fpath, 'rt') as f:
-		for row in f:
-			try: 
-				cals_i += float(row)
-			except ValueError as e:
-				cal_lst.append((n, cals_i))
-				cals_i = 0
-				n += 1
-				
+	cal_lst = [(n, int(int_array(elf).sum())) for n, elf in enumerate(records(fpath))]
 	return sorted(cal_lst, key = lambda x: x[1], reverse = True)
 
 
+def part_1(fpath):
+	return sum_calories_per_elf(fpath)[0][1]
+
+def part_2(fpath):
+	return sum(x[1] for x in sum_calories_per_elf(fpath)[0:3])
+
+def solve_stream(lines):
+	# Only the top three elves are kept, smallest first. A blank line is
+	# added after the last elf so it's counted like the others.
+	top3 = []
+	cals_i = None
+	for row in chain(lines, ['']):
+		if row.strip():
+			cals_i = (cals_i or 0) + int(row)
+		elif cals_i is not None:
+			heapq.heappush(top3, cals_i)
+			if len(top3) > 3:
+				heapq.heappop(top3)
+			cals_i = None
+
+	# No elves, no calories
+	return max(top3, default = 0), sum(top3)
+
+
 
 INPUT = 'day01_input.txt'
 
@@ -0,0 +1,19 @@
+'''Advent of Code 2022: Day 01 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate the calories carried by each elf, one item per line, with a
+    blank line after each elf.
+
+    A scale of 1 gives as many elves as the puzzle input (250).
+    '''
+    rng = random.Random(seed)
+    elves = []
+    for _ in range(max(1, round(250 * scale))):
+        items = [rng.randint(1000, 15000) for _ in range(rng.randint(1, 14))]
+        elves.append(''.join(f'{i}\n' for i in items) + '\n')
+
+    return ''.join(elves)
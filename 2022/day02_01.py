@@ -1,3 +1,6 @@
+from aoc.inputs import lines
+
+
 # Opponent: A = Rock, B = Paper, C = Scissors
 # Self: X = Rock, Y = Paper, X = Scissors
 
@@ -14,16 +17,21 @@ GAME_RESULT = \
 def compute_score(opp, slf):
 	return PLAY_SCORES[slf] + RESULT_SCORE[GAME_RESULT[opp][slf]]
 
+# Every line an input can have, as bytes, and the play it stands for
+PLAYS = {f'{opp} {slf}'.encode(): (opp, slf) for opp in GAME_RESULT for slf in PLAY_SCORES}
+
 def parse_plays_from_file(fpath):
-	with open(fpath, 'rt') as f:
-		for row in f:
-			yield row.split()
+	for row in lines(fpath):
+		yield PLAYS[row.strip()]
 
 def total_strategy_score(plays):
 	return sum(compute_score(i, j) for i, j in plays)
 
+def part_1(fpath):
+	return total_strategy_score(parse_plays_from_file(fpath))
+
 INPUT = 'day02_input.txt'
 
 if __name__ == '__main__':
-	print(total_strategy_score(parse_plays_from_file(INPUT)))
+	print(part_1(INPUT))
 	
\ No newline at end of file
@@ -1,3 +1,7 @@
+from aoc.inputs import lines
+import day02_01
+
+
 # A = Rock, B = Paper, C = Scissors
 
 RESULT_SCORE = {'WIN': 6, 'LOSS': 0, 'DRAW': 3}
@@ -16,20 +20,32 @@ RESULTS_PLAYS = {opp: {res: slf for slf, res in res_map.items()} for opp, res_ma
 def compute_score(opp, slf):
 	return PLAY_SCORES[slf] + RESULT_SCORE[GAME_RESULT[opp][slf]]
 
+# Every line an input can have, as bytes, and the play it stands for
+PLAYS = {f'{opp} {code}'.encode(): (opp, RESULTS_PLAYS[opp][res]) for opp in GAME_RESULT for code, res in RESULT_CODES.items()}
+
 def parse_plays_from_file(fpath):
-	with open(fpath, 'rt') as f:
-		for row in f:
-			opp, res_code = row.split()
-			res = RESULT_CODES[res_code]
-			yield (opp, RESULTS_PLAYS[opp][res])
+	for row in lines(fpath):
+		yield PLAYS[row.strip()]
 			
 def total_strategy_score(plays):
 	return sum(compute_score(i, j) for i, j in plays)
-``
+
+def part_2(fpath):
+	return total_strategy_score(parse_plays_from_file(fpath))
+
+def solve_stream(lines):
+	score_1, score_2 = 0, 0
+	for row in lines:
+		if row.strip():
+			opp, code = row.split()
+			score_1 += day02_01.compute_score(opp, code)
+			score_2 += compute_score(opp, RESULTS_PLAYS[opp][RESULT_CODES[code]])
+	return score_1, score_2
+
 INPUT = 'day02_input.txt'
 
 if __name__ == '__main__':
-	print(total_strategy_score(parse_plays_from_file(INPUT)))
+	print(part_2(INPUT))
 			
 
 			
\ No newline at end of file
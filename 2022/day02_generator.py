@@ -0,0 +1,13 @@
+'''Advent of Code 2022: Day 02 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate a rock, paper, scissors strategy guide, e.g. "A Y".
+
+    A scale of 1 gives as many rounds as the puzzle input (2,500).
+    '''
+    rng = random.Random(seed)
+    return ''.join(f'{rng.choice("ABC")} {rng.choice("XYZ")}\n' for _ in range(max(1, round(2500 * scale))))
@@ -1,6 +1,9 @@
+from aoc.inputs import lines
 
 
-def find_sack_shared_item(contents: str) -> str:
+
+
+def find_sack_shared_item(contents: str | bytes) -> str | int:
     if len(contents) / 2 != int(len(contents) / 2):
         raise ValueError(f"Odd number of contents in sack: {contents}, {len(contents)}")
 
@@ -14,13 +17,17 @@ def find_sack_shared_item(contents: str) -> str:
     return list(shared)[0]
 
 PRIORITIES = {chr(i): i - 97 + 1 for i in range(97, 97 + 26)} | {chr(i): i - 65 + 27 for i in range(65, 65 + 26)}
+# Items read from bytes are byte values
+PRIORITIES |= {ord(item): priority for item, priority in PRIORITIES.items()}
 
 def sack_priorities(fpath: str) -> float:
-    with open(fpath, 'rt') as f:
-        for row in f:
-            yield PRIORITIES[find_sack_shared_item(row.strip())]
+    for row in lines(fpath):
+        yield PRIORITIES[find_sack_shared_item(row.strip())]
+
+def part_1(fpath):
+    return sum(sack_priorities(fpath))
 
 INPUT = 'day03_input.txt'
 
 if __name__ == '__main__':
-    print(sum(sack_priorities(INPUT)))
+    print(part_1(INPUT))
@@ -1,18 +1,35 @@
-from day03_01 import PRIORITIES, INPUT
+from aoc.inputs import lines
+from day03_01 import PRIORITIES, INPUT, find_sack_shared_item
 
 def parse_elf_groups(fpath, group_size = 3):
     group_idx = 0
     contents = []
-    with open(fpath, 'rt') as f:
-        for row in f:
-            contents.append(set(row.strip()))
-            if group_idx == group_size - 1:
-                shared_item = contents[0].intersection(*contents[1:])
-                yield list(shared_item)[0]
-                group_idx = 0
-                contents = []
-            else:
-                group_idx += 1
+    for row in lines(fpath):
+        contents.append(set(row.strip()))
+        if group_idx == group_size - 1:
+            shared_item = contents[0].intersection(*contents[1:])
+            yield list(shared_item)[0]
+            group_idx = 0
+            contents = []
+        else:
+            group_idx += 1
+
+def part_2(fpath):
+    return sum(PRIORITIES[i] for i in parse_elf_groups(fpath))
+
+def solve_stream(lines, group_size = 3):
+    sack_total, badge_total = 0, 0
+    group = []
+    for row in lines:
+        row = row.strip()
+        if not row:
+            continue
+        sack_total += PRIORITIES[find_sack_shared_item(row)]
+        group.append(set(row))
+        if len(group) == group_size:
+            badge_total += PRIORITIES[list(group[0].intersection(*group[1:]))[0]]
+            group = []
+    return sack_total, badge_total
 
 if __name__ == '__main__':
-    print(sum(PRIORITIES[i] for i in parse_elf_groups(INPUT)))
+    print(part_2(INPUT))
@@ -0,0 +1,49 @@
+'''Advent of Code 2022: Day 03 input generator
+'''
+
+import random
+import string
+
+ITEMS = string.ascii_letters
+
+
+def generate_sack(rng: random.Random, items: list[str], badge: str) -> str:
+    '''Generate a rucksack from a pool of items plus the group's badge.
+
+    The two compartments share exactly one item.
+    '''
+    pool = items + [badge]
+    shared = rng.choice(pool)
+    others = [i for i in pool if i != shared]
+    rng.shuffle(others)
+    split = rng.randint(1, len(others) - 1)
+    first, second = others[:split], others[split:]
+
+    size = rng.randint(6, 24)
+    compartments = []
+    for compartment_items in (first, second):
+        compartment = [shared] + ([badge] if badge in compartment_items else [])
+        compartment += rng.choices(compartment_items, k = size - len(compartment))
+        rng.shuffle(compartment)
+        compartments.append(''.join(compartment))
+
+    return ''.join(compartments)
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate rucksack contents, one sack per line, in groups of three elves.
+
+    Each group shares exactly one badge item. Every other item in a sack comes
+    from a pool of items no other elf in the group uses. A scale of 1 gives as
+    many sacks as the puzzle input (300).
+    '''
+    rng = random.Random(seed)
+    sacks = []
+    for _ in range(max(1, round(100 * scale))):
+        badge = rng.choice(ITEMS)
+        items = [i for i in ITEMS if i != badge]
+        rng.shuffle(items)
+        for elf in range(3):
+            sacks.append(generate_sack(rng, items[elf::3], badge) + '\n')
+
+    return ''.join(sacks)
@@ -1,24 +1,49 @@
+from aoc.inputs import read_ints
+
+
 def parse_pairs(fpath):
-    with open(fpath, 'rt') as f:
-        for row in f:
-            (x1, y1), (x2, y2) = (x.split('-') for x in row.strip().split(","))
-            yield (int(x1), int(y1)), (int(x2), int(y2))
+    for x1, y1, x2, y2 in read_ints(fpath, stride = 4, negative = False).tolist():
+        yield (x1, y1), (x2, y2)
+
+def is_covering(pair):
+    (x1, y1), (x2, y2) = pair
+    return (x1 <= x2 and y1 >= y2) or (x2 <= x1 and y2 >= y1)
+
+def is_overlapping(pair):
+    (x1, y1), (x2, y2) = pair
+    return (x1 <= x2 and y1 >= x2) or (x2 <= x1 and y2 >= y1) or (y1 >= y2 and x1 <= y2) or (y2 >= y1 and x2 <= y1)
 
 # Part 1
 def check_covered_pairs(pairs):
-    for (x1, y1), (x2, y2) in pairs:
-        if (x1 <= x2 and y1 >= y2) or (x2 <= x1 and y2 >= y1):
-            yield (x1, y1), (x2, y2)
+    for pair in pairs:
+        if is_covering(pair):
+            yield pair
 
 # Part 2
 def check_overlapping_pairs(pairs):
-    for (x1, y1), (x2, y2) in pairs:
-        if (x1 <= x2 and y1 >= x2) or (x2 <= x1 and y2 >= y1) or (y1 >= y2 and x1 <= y2) or (y2 >= y1 and x2 <= y1):
-            yield (x1, y1), (x2, y2)
+    for pair in pairs:
+        if is_overlapping(pair):
+            yield pair
+
+def part_1(fpath):
+    return len([x for x in check_covered_pairs(parse_pairs(fpath))])
+
+def part_2(fpath):
+    return len([x for x in check_overlapping_pairs(parse_pairs(fpath))])
+
+def solve_stream(lines):
+    covering, overlapping = 0, 0
+    for row in lines:
+        if row.strip():
+            (x1, y1), (x2, y2) = (x.split('-') for x in row.strip().split(','))
+            pair = (int(x1), int(y1)), (int(x2), int(y2))
+            covering += is_covering(pair)
+            overlapping += is_overlapping(pair)
+    return covering, overlapping
 
 
 INPUT = "day04_input.txt"
 
 if __name__ == '__main__':
-    print("Covering pairs:", len([x for x in check_covered_pairs(parse_pairs(INPUT))]))
-    print("Overlapping pairs:", len([x for x in check_overlapping_pairs(parse_pairs(INPUT))]))
\ No newline at end of file
+    print("Covering pairs:", part_1(INPUT))
+    print("Overlapping pairs:", part_2(INPUT))
\ No newline at end of file
@@ -0,0 +1,18 @@
+'''Advent of Code 2022: Day 04 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate pairs of section assignments, e.g. "2-4,6-8".
+
+    A scale of 1 gives as many pairs as the puzzle input (1,000).
+    '''
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(max(1, round(1000 * scale))):
+        (x1, y1), (x2, y2) = (sorted((rng.randint(1, 99), rng.randint(1, 99))) for _ in range(2))
+        pairs.append(f'{x1}-{y1},{x2}-{y2}\n')
+
+    return ''.join(pairs)
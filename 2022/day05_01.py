@@ -1,24 +1,26 @@
 from collections import deque
 import re
 
+from aoc.cache import cached_parser
+from aoc.inputs import lines, text_lines
+
 def find_number_of_stacks_from_input(fpath: str) -> int:
-    with open(fpath, 'rt') as f:
-        for row in f:
-            stack_labels = parse_stack_label_row(row)
-            if len(stack_labels) > 0:
-                return max(stack_labels)
-        else:
-            raise ValueError(f"Could not find stack label row in input {fpath}")
+    for row in text_lines(fpath):
+        stack_labels = parse_stack_label_row(row)
+        if len(stack_labels) > 0:
+            return max(stack_labels)
+    else:
+        raise ValueError(f"Could not find stack label row in input {fpath}")
                 
+@cached_parser()
 def read_stacks_from_input(fpath):
     stacks = []
-    with open(fpath, 'rt') as f:
-        for row in f:
-            if len(parse_stack_label_row(row)) > 0:
-                break
-            else:
-                parsed_stacks = parse_stack_input_row(row)
-                stacks.append(parsed_stacks)
+    for row in text_lines(fpath):
+        if len(parse_stack_label_row(row)) > 0:
+            break
+        else:
+            parsed_stacks = parse_stack_input_row(row)
+            stacks.append(parsed_stacks)
     return stacks
 
 def parse_stack_input_row(row):
@@ -57,12 +59,13 @@ def move_stack_items_multi(stacks, source: int, dest: int, n_times: int) -> None
     stacks[dest - 1].extendleft(items)
     return None
 
+@cached_parser()
 def read_instructions_from_input(fpath):
     instructions = []
-    with open(fpath, 'rt') as f:
-        for row in f:
-            if is_instruction(row):
-                instructions.append(parse_instruction(row))
+    for row in lines(fpath):
+        if row.startswith(b'move'):
+            n_times, source, dest = (int(x) for x in row.split()[1::2])
+            instructions.append({'source': source, 'dest': dest, 'n_times': n_times})
     return instructions
 
 INSTRUCTION_PATTERN = re.compile(r'^move (\d+) from (\d+) to (\d+)$', flags = re.I)
@@ -83,17 +86,38 @@ def run_stack_movement_instructions(stacks, instructions, multi = False):
             move_stack_items(stacks, **instruction)
     return None
 
+def part_1(fpath):
+    stacks = create_stacks_from_list(read_stacks_from_input(fpath))
+    run_stack_movement_instructions(stacks, read_instructions_from_input(fpath))
+    return ''.join([stack[0] for stack in stacks])
+
+def part_2(fpath):
+    stacks = create_stacks_from_list(read_stacks_from_input(fpath))
+    run_stack_movement_instructions(stacks, read_instructions_from_input(fpath), multi = True)
+    return ''.join([stack[0] for stack in stacks])
+
+def solve_stream(lines):
+    lines = iter(lines)
+    stack_rows = []
+    for row in lines:
+        if len(parse_stack_label_row(row)) > 0:
+            break
+        stack_rows.append(parse_stack_input_row(row))
+
+    # Both cranes work from their own copy of the stacks as instructions arrive
+    stacks, multi_stacks = create_stacks_from_list(stack_rows), create_stacks_from_list(stack_rows)
+    for row in lines:
+        if is_instruction(row.strip()):
+            instruction = parse_instruction(row.strip())
+            move_stack_items(stacks, **instruction)
+            move_stack_items_multi(multi_stacks, **instruction)
+
+    return ''.join([stack[0] for stack in stacks]), ''.join([stack[0] for stack in multi_stacks])
+
 
 INPUT = 'day05_input.txt'
 
 
 if __name__ == '__main__':
-    stacks_01 = create_stacks_from_list(read_stacks_from_input(INPUT))
-    stacks_02 = create_stacks_from_list(read_stacks_from_input(INPUT))
-
-    instructions = read_instructions_from_input(INPUT)
-    run_stack_movement_instructions(stacks_01, instructions)
-    print("Part 1:", ''.join([stack[0] for stack in stacks_01]))
-
-    run_stack_movement_instructions(stacks_02, instructions, multi = True)
-    print("Part 2:", ''.join([stack[0] for stack in stacks_02]))
\ No newline at end of file
+    print("Part 1:", part_1(INPUT))
+    print("Part 2:", part_2(INPUT))
\ No newline at end of file
@@ -0,0 +1,35 @@
+'''Advent of Code 2022: Day 05 input generator
+'''
+
+import random
+import string
+
+
+def generate(scale: float = 1, seed: int = 0, nstacks: int = 9) -> str:
+    '''Generate a drawing of stacks of crates followed by rearrangement
+    instructions, e.g. "move 1 from 2 to 1".
+
+    Instructions never empty a stack, so every stack has a crate on top at the
+    end. A scale of 1 gives as many instructions as the puzzle input (500).
+    '''
+    rng = random.Random(seed)
+    stacks = [rng.choices(string.ascii_uppercase, k = rng.randint(2, 8)) for _ in range(nstacks)]
+    height = max(len(s) for s in stacks)
+
+    # Draw the stacks top down, padding short stacks with spaces
+    rows = []
+    for level in range(height, 0, -1):
+        crates = [f'[{s[-level]}]' if len(s) >= level else '   ' for s in stacks]
+        rows.append(' '.join(crates) + '\n')
+    rows.append(' '.join(f' {i + 1} ' for i in range(nstacks)) + '\n\n')
+
+    sizes = [len(s) for s in stacks]
+    for _ in range(max(1, round(500 * scale))):
+        source = rng.choice([i for i, n in enumerate(sizes) if n > 1])
+        dest = rng.choice([i for i in range(nstacks) if i != source])
+        n = rng.randint(1, sizes[source] - 1)
+        sizes[source] -= n
+        sizes[dest] += n
+        rows.append(f'move {n} from {source + 1} to {dest + 1}\n')
+
+    return ''.join(rows)
@@ -1,23 +1,54 @@
-from collections import deque, namedtuple
+from collections import namedtuple
+
+from aoc.inputs import mapped
 
 DecoderResults = namedtuple('DecoderResults', ['processed_tokens', 'marker'])
 
 def decode_stream(fpath, marker_len):
-    buffer = deque(maxlen = marker_len)
-    processed_tokens = 0
-
-    with open(fpath, 'rt') as f:
-            while True:
-                c = f.read(1)
-                if not c:
-                    return None
-                else: 
-                    processed_tokens += 1
-                    buffer.append(c)
-                    if len(set(buffer)) == marker_len:
-                        marker = ''.join(buffer)
-                        return DecoderResults(processed_tokens = processed_tokens, 
-                                              marker = marker)
+    # The window starts just after the last repeated token, so each token is
+    # looked at once instead of re-checking the whole window.
+    last_seen = {}
+    start = 0
+
+    with mapped(fpath) as buf:
+        for i in range(len(buf)):
+            c = buf[i]
+            if last_seen.get(c, -1) >= start:
+                start = last_seen[c] + 1
+            last_seen[c] = i
+            if i - start + 1 == marker_len:
+                return DecoderResults(processed_tokens = i + 1,
+                                      marker = buf[start:i + 1].decode())
+    return None
+
+def solve_stream(lines, marker_lens = (4, 14)):
+    # One window per marker, fed the stream a character at a time
+    last_seen = [{} for _ in marker_lens]
+    starts = [0 for _ in marker_lens]
+    found = [None for _ in marker_lens]
+    i = 0
+
+    for line in lines:
+        for c in line:
+            for m, marker_len in enumerate(marker_lens):
+                if found[m] is not None:
+                    continue
+                if last_seen[m].get(c, -1) >= starts[m]:
+                    starts[m] = last_seen[m][c] + 1
+                last_seen[m][c] = i
+                if i - starts[m] + 1 == marker_len:
+                    found[m] = i + 1
+            if all(f is not None for f in found):
+                return tuple(found)
+            i += 1
+
+    return tuple(found)
+
+def part_1(fpath):
+    return decode_stream(fpath, 4).processed_tokens
+
+def part_2(fpath):
+    return decode_stream(fpath, 14).processed_tokens
 
 
 INPUT = 'day06_input.txt'
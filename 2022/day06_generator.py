@@ -0,0 +1,17 @@
+'''Advent of Code 2022: Day 06 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate a datastream whose markers sit at the very end.
+
+    The stream is made of just three letters, so no marker can appear in it,
+    until a run of 14 distinct letters closes it off. A scale of 1 gives a
+    stream as long as the puzzle input (4,096).
+    '''
+    rng = random.Random(seed)
+    length = max(14, round(4096 * scale))
+    body = ''.join(rng.choices('abc', k = length - 14))
+    return body + ''.join(rng.sample('defghijklmnopqrstuvwxyz', 14))
@@ -1,6 +1,9 @@
 from collections import deque, namedtuple
 import re
 
+from aoc.cache import cached_parser
+from aoc.inputs import text_lines
+
 Directory = namedtuple('Directory', ['path', 'children', 'files'])
 File = namedtuple('File', ['name', 'size'])
 
@@ -64,8 +67,30 @@ def parse_commands(cmds):
     return filetree
 
 def read_commands_from_input(fpath):
-    with open(fpath, 'rt') as f:
-        return [r.strip() for r in f.readlines()]
+    return [r.strip() for r in text_lines(fpath)]
+
+@cached_parser()
+def read_file_tree_from_input(fpath):
+    return parse_commands(read_commands_from_input(fpath))
+
+def part_1(fpath, max_size = 100_000):
+    ftree = read_file_tree_from_input(fpath)
+    return sum(size for size in (dir_size(d, ftree) for d in ftree) if size <= max_size)
+
+def part_2(fpath, total_space = 70_000_000, update_space = 30_000_000):
+    ftree = read_file_tree_from_input(fpath)
+    available_space = total_space - dir_size('/', ftree)
+    needed_space = max(0, update_space - available_space)
+    return min(size for size in (dir_size(d, ftree) for d in ftree) if size >= needed_space)
+
+def solve_stream(lines, max_size = 100_000, total_space = 70_000_000, update_space = 30_000_000):
+    # Only the file tree is kept, not the commands that describe it
+    ftree = parse_commands(line.strip() for line in lines if line.strip())
+    if '/' not in ftree:
+        return 0, 0
+    sizes = [dir_size(d, ftree) for d in ftree]
+    needed_space = max(0, update_space - (total_space - dir_size('/', ftree)))
+    return sum(size for size in sizes if size <= max_size), min(size for size in sizes if size >= needed_space)
 
 
 INPUT = 'day07_input.txt'
@@ -0,0 +1,55 @@
+'''Advent of Code 2022: Day 07 input generator
+'''
+
+import random
+import string
+
+
+def random_name(rng: random.Random, taken: set) -> str:
+    while True:
+        name = ''.join(rng.choices(string.ascii_lowercase, k = rng.randint(1, 8)))
+        if rng.random() < 0.5:
+            name += '.' + ''.join(rng.choices(string.ascii_lowercase, k = 3))
+        if name not in taken:
+            taken.add(name)
+            return name
+
+
+def generate(scale: float = 1, seed: int = 0, max_depth: int = 10) -> str:
+    '''Generate a terminal session that walks a file system with cd and ls.
+
+    Every directory is listed exactly once. A scale of 1 gives about as many
+    directories as the puzzle input (180).
+    '''
+    rng = random.Random(seed)
+
+    # Grow a random tree: each new directory goes under an existing one
+    children = [[]]
+    parents = [0]
+    depth = [0]
+    for d in range(1, max(1, round(180 * scale))):
+        parent = rng.randrange(d)
+        while depth[parent] >= max_depth:
+            parent = parents[parent]
+        children.append([])
+        children[parent].append(d)
+        parents.append(parent)
+        depth.append(depth[parent] + 1)
+
+    lines = ['$ cd /\n']
+
+    def walk(d):
+        taken = set()
+        names = [random_name(rng, taken) for _ in children[d]]
+        lines.append('$ ls\n')
+        entries = [f'dir {n}\n' for n in names]
+        entries += [f'{rng.randint(1000, 300000)} {random_name(rng, taken)}\n' for _ in range(rng.randint(0, 4))]
+        rng.shuffle(entries)
+        lines.extend(entries)
+        for child, name in zip(children[d], names):
+            lines.append(f'$ cd {name}\n')
+            walk(child)
+            lines.append('$ cd ..\n')
+
+    walk(0)
+    return ''.join(lines)
@@ -1,49 +1,57 @@
-from typing import Iterable
 import numpy as np
 
+from aoc.cache import cached_parser
+from aoc.grid import Grid
+
+@cached_parser(version = 2)
 def read_map(fpath):
-    with open(fpath, 'rt') as f:
-        return np.array([[int(x) for x in row.strip()] for row in f])
-    
+    return Grid.from_file(fpath)
+
+def tree_heights(map: Grid) -> np.ndarray:
+    return (map.cells - ord('0')).astype(int)
+
+# Looking along a direction is the same as looking left across the heights
+# flipped or transposed the right way, so each measure is written for the
+# left and applied to all four views.
+VIEWS = [lambda a: a, lambda a: a[:, ::-1], lambda a: a.T, lambda a: a.T[:, ::-1]]
+
+def visible_from_left(heights):
+    tallest_before = np.maximum.accumulate(heights, axis = 1)
+    tallest_before = np.hstack([np.full((heights.shape[0], 1), -1), tallest_before[:, :-1]])
+    return heights > tallest_before
+
+def view_to_left(heights):
+    # For every row and height, the column of the last tree at least that tall
+    nrows, ncols = heights.shape
+    last_blocker = np.zeros((nrows, 10), dtype = int)
+    rows = np.arange(nrows)
+    views = np.empty_like(heights)
+
+    for j in range(ncols):
+        views[:, j] = j - last_blocker[rows, heights[:, j]]
+        last_blocker[np.arange(10) <= heights[:, j, None]] = j
+
+    return views
 
 def find_visible_trees(map):
-   
-    visible_trees = []
-    for i in range(map.shape[0]):
-        for j in range(map.shape[1]):
-            height = map[i, j]
-            tallest_left = np.max(map[i, :j], initial = -1)
-            tallest_right = np.max(map[i, (j+1):], initial = -1)
-            tallest_up = np.max(map[:i, j], initial = -1)
-            tallest_down = np.max(map[(i+1):, j], initial = -1)
-
-            if min([tallest_left, tallest_right, tallest_up, tallest_down]) < height:
-                visible_trees.append((i, j))
-
-    return visible_trees
-
-def first_n_shorter(x: int, xs: Iterable[int]) -> int:
-    if len(xs) <= 0:
-        return 0
-    
-    for i, xi in enumerate(xs):
-        if xi >= x:
-            break
-    return i + 1
+    heights = tree_heights(map)
+    visible = np.zeros(heights.shape, dtype = bool)
+    for view in VIEWS:
+        view(visible)[...] |= visible_from_left(view(heights))
+    return list(zip(*np.nonzero(visible)))
 
 def compute_view_areas(map):
-    view_areas = np.empty_like(map)
+    heights = tree_heights(map)
+    view_areas = np.ones_like(heights)
+    for view in VIEWS:
+        view(view_areas)[...] *= view_to_left(view(heights))
+    return view_areas
 
-    for i in range(map.shape[0]):
-        for j in range(map.shape[1]):
-            height = map[i, j]
-            view_left = first_n_shorter(height, map[i, :j][::-1])
-            view_right = first_n_shorter(height, map[i, (j+1):])
-            view_up = first_n_shorter(height, map[:i, j, ][::-1])
-            view_down = first_n_shorter(height, map[(i+1):, j])
-            view_areas[i, j] = view_left * view_right * view_up * view_down
+def part_1(fpath):
+    return len(find_visible_trees(read_map(fpath)))
 
-    return view_areas
+def part_2(fpath):
+    return int(np.max(compute_view_areas(read_map(fpath))))
 
 INPUT = 'day08_input.txt'
 
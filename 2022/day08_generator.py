@@ -0,0 +1,14 @@
+'''Advent of Code 2022: Day 08 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate a square map of tree heights, one digit per tree.
+
+    A scale of 1 gives as many trees as the puzzle input (99 x 99).
+    '''
+    rng = random.Random(seed)
+    side = max(1, round(99 * scale ** 0.5))
+    return ''.join(''.join(rng.choices('0123456789', k = side)) + '\n' for _ in range(side))
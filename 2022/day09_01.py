@@ -1,6 +1,9 @@
 from collections import deque, namedtuple
 import re
 
+from aoc.cache import cached_parser
+from aoc.inputs import text_lines
+
 def move_tail(head_coords, tail_coords):
     xh, yh = head_coords
     xt, yt = tail_coords
@@ -46,9 +49,9 @@ def parse_movement(cmd):
     
 INPUT = 'day09_input.txt'
 
+@cached_parser()
 def read_movements_from_input(fpath):
-    with open(fpath, 'rt') as f:
-        return [parse_movement(cmd.strip()) for cmd in f]
+    return [parse_movement(cmd.strip()) for cmd in text_lines(fpath)]
     
 def move_rope(head_coords, tail_coords, mvmt):
     for i in range(mvmt.n):
@@ -70,6 +73,31 @@ def trace_movements(nknots, movements, init_coords = (0, 0)):
 
     return coord_traces
 
+def part_1(fpath):
+    return len(set(trace_movements(2, read_movements_from_input(fpath))[-1]))
+
+def part_2(fpath):
+    return len(set(trace_movements(10, read_movements_from_input(fpath))[-1]))
+
+def solve_stream(lines, nknots = 10, init_coords = (0, 0)):
+    # The knot behind the head moves just like the tail of a two knot rope,
+    # so one rope answers both parts. Only the visited positions are kept.
+    knots = [init_coords] * nknots
+    visited_2, visited_n = {init_coords}, {init_coords}
+
+    for cmd in lines:
+        if not cmd.strip():
+            continue
+        movement = parse_movement(cmd.strip())
+        for i in range(movement.n):
+            knots[0] = move_head(knots[0], movement.dirs)
+            for k in range(1, nknots):
+                knots[k] = move_tail(knots[k - 1], knots[k])
+            visited_2.add(knots[1])
+            visited_n.add(knots[-1])
+
+    return len(visited_2), len(visited_n)
+
 
 if __name__ == '__main__':
     movements = read_movements_from_input(INPUT)
@@ -0,0 +1,13 @@
+'''Advent of Code 2022: Day 09 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate rope head movements, e.g. "R 4".
+
+    A scale of 1 gives as many movements as the puzzle input (2,000).
+    '''
+    rng = random.Random(seed)
+    return ''.join(f'{rng.choice("UDLR")} {rng.randint(1, 19)}\n' for _ in range(max(1, round(2000 * scale))))
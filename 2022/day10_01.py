@@ -3,6 +3,9 @@ import math
 import re
 from typing import Iterable
 
+from aoc.cache import cached_parser
+from aoc.inputs import text_lines
+
 Instruction = namedtuple('Instruction', ['instruction', 'amount', 'cycles'])
 
 instruction_pattern = re.compile(r"^(?P<ins>(noop|addx))\s*(?P<amt>\-?[0-9]+)?$", re.I)
@@ -17,10 +20,9 @@ def parse_instruction(x):
 
     return Instruction(instruction, amount, cycles)
 
+@cached_parser()
 def read_instructions_from_input(fpath):
-    with open(fpath, 'rt') as f:
-        for row in f:
-            yield parse_instruction(row.strip())
+    return [parse_instruction(row.strip()) for row in text_lines(fpath)]
 
 
 def run_instructions(instructions: Iterable[Instruction], 
@@ -66,6 +68,40 @@ def draw_screen(reg_values, crt_width, crt_height):
         screen.append('\n')
     return ''.join(screen)
 
+def solve_stream(lines, cycles = (20, 60, 100, 140, 180, 220), crt_width = 40, crt_height = 6):
+    # The register is followed a cycle at a time, keeping the screen and the
+    # running signal strength rather than every register value.
+    reg_value = 1
+    cycle = 1
+    strength = 0
+    screen = []
+
+    for row in lines:
+        if not row.strip():
+            continue
+        ins = parse_instruction(row.strip())
+        for _ in range(ins.cycles):
+            if cycle in cycles:
+                strength += cycle * reg_value
+            if cycle <= crt_width * crt_height:
+                position = (cycle - 1) % crt_width
+                screen.append('#' if reg_value - 1 <= position <= reg_value + 1 else '.')
+                if position == crt_width - 1:
+                    screen.append('\n')
+            cycle += 1
+        if ins.instruction == 'addx':
+            reg_value += ins.amount
+
+    return strength, ''.join(screen)
+
+def part_1(fpath, cycles = (20, 60, 100, 140, 180, 220)):
+    cycle_values = compute_cycle_values(run_instructions(read_instructions_from_input(fpath)))
+    return sum(cycle_values[i-1] for i in cycles)
+
+def part_2(fpath, crt_width = 40, crt_height = 6):
+    reg_values = run_instructions(read_instructions_from_input(fpath))
+    return draw_screen(reg_values, crt_width, crt_height)
+
 
 INPUT = 'day10_input.txt'
 
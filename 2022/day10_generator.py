@@ -0,0 +1,27 @@
+'''Advent of Code 2022: Day 10 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate a CPU program of noop and addx instructions.
+
+    The program always runs for long enough to draw the whole screen (240
+    cycles) and keeps the register roughly on screen. A scale of 1 gives as
+    many cycles as the puzzle input (240).
+    '''
+    rng = random.Random(seed)
+    x, cycles = 1, 0
+    program = []
+    while cycles <= max(240, round(240 * scale)):
+        if rng.random() < 0.3:
+            program.append('noop\n')
+            cycles += 1
+        else:
+            amount = rng.choice([a for a in range(-10, 11) if a != 0 and -5 <= x + a <= 45])
+            x += amount
+            program.append(f'addx {amount}\n')
+            cycles += 2
+
+    return ''.join(program)
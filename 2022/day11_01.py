@@ -1,9 +1,14 @@
 from collections import deque, namedtuple
 from dataclasses import dataclass
+from itertools import chain
 import math
 import re
 from typing import Deque
 
+from aoc.cache import cached_parser
+from aoc.inputs import records
+from aoc.instrument import instrumented
+
 
 @dataclass
 class Monkey:
@@ -15,6 +20,7 @@ class Monkey:
     false_throw: int
     inspect_times:int = 0
 
+    @instrumented()
     def inspect_next_item(self, div = None, mod = None):
         item = self.items.pop()
        
@@ -37,20 +43,12 @@ class Monkey:
         other.items.appendleft(item)
         return None
 
+@cached_parser()
 def create_monkeys_from_commands(fpath):
     monkeys = []
-    commands = []
-    with open(fpath, 'rt') as f:
-        for row in f:
-            if len(row.strip()) > 0:
-                commands.append(row.strip())
-            else:
-                monkeys.append(create_monkey(commands))
-                commands = []
-        else:
-            monkeys.append(create_monkey(commands))
-            commands = []
-            
+    for record in records(fpath):
+        commands = [row.strip() for row in record.decode().splitlines()]
+        monkeys.append(create_monkey(commands))
     return monkeys
 
 def create_monkey(commands):
@@ -71,6 +69,40 @@ def compute_monkey_business(monkeys):
     activity = (m.inspect_times for m in monkeys)
     return math.prod(sorted(activity, reverse = True)[:2])
 
+def play_rounds(monkeys, nrounds, div = None, mod = None):
+    for _ in range(nrounds):
+        for monkey in monkeys:
+            while(monkey.items):
+                monkey.throw_next_item(monkeys, div = div, mod = mod)
+    return monkeys
+
+def part_1(fpath):
+    monkeys = create_monkeys_from_commands(fpath)
+    return compute_monkey_business(play_rounds(monkeys, 20, div = 3))
+
+def part_2(fpath):
+    monkeys = create_monkeys_from_commands(fpath)
+    mod_reduction = math.prod(m.divisor for m in monkeys)
+    return compute_monkey_business(play_rounds(monkeys, 10000, mod = mod_reduction))
+
+def solve_stream(lines):
+    # Each monkey is created twice as its notes end, once for each part
+    monkeys, worried_monkeys = [], []
+    commands = []
+    for row in chain(lines, ['']):
+        if row.strip():
+            commands.append(row.strip())
+        elif commands:
+            monkeys.append(create_monkey(commands))
+            worried_monkeys.append(create_monkey(commands))
+            commands = []
+
+    if not monkeys:
+        return 0, 0
+    mod_reduction = math.prod(m.divisor for m in worried_monkeys)
+    return (compute_monkey_business(play_rounds(monkeys, 20, div = 3)),
+            compute_monkey_business(play_rounds(worried_monkeys, 10000, mod = mod_reduction)))
+
 
 INPUT = "day11_input.txt"
 
@@ -78,11 +110,7 @@ if __name__ == '__main__':
     # Part 1
     monkeys = create_monkeys_from_commands(INPUT)
 
-    nrounds = 20
-    for _ in range(nrounds):
-        for monkey in monkeys:
-            while(monkey.items):
-                monkey.throw_next_item(monkeys, div = 3)
+    play_rounds(monkeys, 20, div = 3)
 
     for m in monkeys:
         print(m.id, m.inspect_times)
@@ -92,13 +120,8 @@ if __name__ == '__main__':
     # Part 2
     monkeys = create_monkeys_from_commands(INPUT)
 
-    nrounds = 10000
     mod_reduction = math.prod(m.divisor for m in monkeys)
-
-    for r in range(nrounds):
-        for monkey in monkeys:
-            while(monkey.items):
-                monkey.throw_next_item(monkeys, mod = mod_reduction)
+    play_rounds(monkeys, 10000, mod = mod_reduction)
 
     for m in monkeys:
         print(m.id, m.inspect_times)
@@ -0,0 +1,37 @@
+'''Advent of Code 2022: Day 11 input generator
+'''
+
+import random
+
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
+
+
+def generate(scale: float = 1, seed: int = 0, nmonkeys: int = 8) -> str:
+    '''Generate the notes on a troop of monkeys.
+
+    Every monkey tests divisibility by a different prime and starts with at
+    least one item. A scale of 1 gives as many items as the puzzle input (36).
+    '''
+    rng = random.Random(seed)
+    divisors = rng.sample(PRIMES, nmonkeys)
+    squarer = rng.randrange(nmonkeys)
+
+    items = [[] for _ in range(nmonkeys)]
+    for i in range(max(nmonkeys, round(36 * scale))):
+        items[i if i < nmonkeys else rng.randrange(nmonkeys)].append(rng.randint(50, 99))
+
+    monkeys = []
+    for m in range(nmonkeys):
+        if m == squarer:
+            operation = 'old * old'
+        else:
+            operation = f'old {rng.choice("*++")} {rng.randint(1, 8)}'
+        true_throw, false_throw = rng.sample([i for i in range(nmonkeys) if i != m], 2)
+        monkeys.append(f'Monkey {m}:\n'
+                       f'  Starting items: {", ".join(str(i) for i in items[m])}\n'
+                       f'  Operation: new = {operation}\n'
+                       f'  Test: divisible by {divisors[m]}\n'
+                       f'    If true: throw to monkey {true_throw}\n'
+                       f'    If false: throw to monkey {false_throw}\n')
+
+    return '\n'.join(monkeys)
@@ -0,0 +1,32 @@
+'''Advent of Code 2022: Day 12 input generator
+'''
+
+import random
+import string
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate a heightmap with a start (S) on the left and the end (E) on the right.
+
+    Elevation climbs steadily from a on the left edge to z on the right, with
+    noise on top. One row is left without noise so that there is always a path
+    from S to E. A scale of 1 gives as many squares as the puzzle input (41 x 159).
+    '''
+    rng = random.Random(seed)
+    nrows = max(1, round(41 * scale ** 0.5))
+    ncols = max(26, round(159 * scale ** 0.5))
+    path_row = rng.randrange(nrows)
+
+    rows = []
+    for i in range(nrows):
+        row = []
+        for j in range(ncols):
+            elevation = 26 * j // ncols
+            if i != path_row:
+                elevation = min(25, max(0, elevation + rng.randint(-3, 3)))
+            row.append(string.ascii_lowercase[elevation])
+        if i == path_row:
+            row[0], row[-1] = 'S', 'E'
+        rows.append(''.join(row) + '\n')
+
+    return ''.join(rows)
@@ -1,5 +1,7 @@
 import re
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Tuple
+
+from aoc.inputs import text_lines
 
 # A function that takes a line of text and extracts and parses digits from it.
 DigitParser = Callable[[str], Iterable[int]]
@@ -35,6 +37,29 @@ def decode_calibration_document(input: Iterable, digit_parser: DigitParser) -> i
     return sum(combine_digits(digit_parser(line)) for line in input)
 
 
+def part_1(input_file: str) -> int:
+    '''Decode a calibration document from a file using only numeric digits.
+    '''
+    return decode_calibration_document(text_lines(input_file), parse_numeric_digits)
+
+
+def part_2(input_file: str) -> int:
+    '''Decode a calibration document from a file using numeric and word digits.
+    '''
+    return decode_calibration_document(text_lines(input_file), parse_numeric_and_word_digits)
+
+
+def solve_stream(lines: Iterable[str]) -> Tuple[int, int]:
+    '''Decode a calibration document both ways in one pass over its lines.
+    '''
+    numeric, numeric_and_word = 0, 0
+    for line in lines:
+        numeric += combine_digits(parse_numeric_digits(line))
+        numeric_and_word += combine_digits(parse_numeric_and_word_digits(line))
+
+    return numeric, numeric_and_word
+
+
 # Instruction examples
 test_01 = """1abc2
 pqr3stu8vwx
@@ -56,10 +81,8 @@ if __name__ == '__main__':
     # Test instruction examples
     assert decode_calibration_document(test_01, parse_numeric_digits) == 142, "Test 1 failed"
     assert decode_calibration_document(test_02, parse_numeric_and_word_digits) == 281, "Test 2 failed"
+    assert solve_stream(test_02)[1] == 281, "Stream test failed"
 
     # Run on input
-    with open(input_file, 'rt') as f:
-        print('Part 1:', decode_calibration_document(f, parse_numeric_digits))
-    
-    with open(input_file, 'rt') as f:
-        print('Part 2:', decode_calibration_document(f, parse_numeric_and_word_digits))
+    print('Part 1:', part_1(input_file))
+    print('Part 2:', part_2(input_file))
@@ -0,0 +1,31 @@
+'''Advent of Code 2023: Day 01 input generator
+'''
+
+import random
+import string
+
+WORD_DIGITS = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate a calibration document mixing letters, digits and spelled out digits.
+
+    Every line has at least one numeric digit. A scale of 1 gives as many lines
+    as the puzzle input (1,000).
+    '''
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(max(1, round(1000 * scale))):
+        pieces = [rng.choice('123456789')]
+        for _ in range(rng.randint(1, 8)):
+            kind = rng.random()
+            if kind < 0.3:
+                pieces.append(rng.choice('123456789'))
+            elif kind < 0.6:
+                pieces.append(rng.choice(WORD_DIGITS))
+            else:
+                pieces.append(''.join(rng.choices(string.ascii_lowercase, k = rng.randint(1, 5))))
+        rng.shuffle(pieces)
+        lines.append(''.join(pieces) + '\n')
+
+    return ''.join(lines)
@@ -1,6 +1,9 @@
-from typing import Iterable, List, NamedTuple
+from typing import Iterable, List, NamedTuple, Tuple
 import re
 
+from aoc.cache import cached_parser
+from aoc.inputs import text_lines
+
 
 class Draw(NamedTuple):
     red: int
@@ -78,6 +81,39 @@ def bag_power(bag: Bag) -> int:
     return bag.red * bag.green * bag.blue
 
 
+@cached_parser()
+def read_games(input: str) -> List[Game]:
+    '''Read the record of games from an input file.
+    '''
+    return [parse_game(row.strip()) for row in text_lines(input)]
+
+
+def part_1(input: str, bag: Bag = Bag(red = 12, green = 13, blue = 14)) -> int:
+    '''Sum the IDs of the games in an input file that could be played from a bag.
+    '''
+    return sum(possible_games(read_games(input), bag))
+
+
+def part_2(input: str) -> int:
+    '''Sum the powers of the minimum bags for the games in an input file.
+    '''
+    return sum(bag_power(minimum_bag(g)) for g in read_games(input))
+
+
+def solve_stream(lines: Iterable[str], bag: Bag = Bag(red = 12, green = 13, blue = 14)) -> Tuple[int, int]:
+    '''Sum the IDs of the possible games and the powers of their minimum bags
+    in one pass over lines of games.
+    '''
+    possible_ids, powers = 0, 0
+    for line in lines:
+        if line.strip():
+            game = parse_game(line.strip())
+            possible_ids += game.id if is_game_possible(game, bag) else 0
+            powers += bag_power(minimum_bag(game))
+
+    return possible_ids, powers
+
+
 # Example from instructions
 test_01 = """Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green
 Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue
@@ -95,13 +131,11 @@ if __name__ == '__main__':
     # Test examples from instructions
     assert possible_games([parse_game(g) for g in test_01.splitlines()], bag) == [1, 2, 5], "Test 1 failed"
     assert sum(bag_power(b) for b in (minimum_bag(parse_game(g)) for g in test_01.splitlines())) == 2286, "Test 2 failed"
+    assert solve_stream(test_01.splitlines(), bag) == (8, 2286), "Stream test failed"
 
     # Run on input
-    with open(input, 'rt') as f:
-        games = [parse_game(row.strip()) for row in  f]
-        minimum_bags = [minimum_bag(g) for g in games]
-        print('Part 1:', sum(possible_games(games, bag)))
-        print('Part 2:', sum(bag_power(b) for b in minimum_bags))
+    print('Part 1:', part_1(input, bag))
+    print('Part 2:', part_2(input))
     
     
 
@@ -0,0 +1,21 @@
+'''Advent of Code 2023: Day 02 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate a record of games, e.g. "Game 1: 3 blue, 4 red; 1 red, 2 green".
+
+    A scale of 1 gives as many games as the puzzle input (100).
+    '''
+    rng = random.Random(seed)
+    games = []
+    for game_id in range(1, max(1, round(100 * scale)) + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(['red', 'green', 'blue'], rng.randint(1, 3))
+            draws.append(', '.join(f'{rng.randint(1, 20)} {c}' for c in colors))
+        games.append(f'Game {game_id}: {"; ".join(draws)}\n')
+
+    return ''.join(games)
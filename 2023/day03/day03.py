@@ -1,10 +1,15 @@
 from collections import defaultdict
-import re
 from typing import List, NamedTuple, Tuple
 
+import numpy as np
+
+from aoc.cache import cached_parser
+from aoc.grid import ADJACENT, Grid, dilate
+from aoc.inputs import int_array
+
 
 Point = Tuple[int, int]
-Schematic = List[str]
+Schematic = Grid
 
 
 class PartNumber(NamedTuple):
@@ -12,81 +17,54 @@ class PartNumber(NamedTuple):
     schematic_location: Point
 
 
-class Symbol(NamedTuple):
-    symbol: str
-    schematic_location: Point
-
-
 def parse_schematic(s: str) -> Schematic:
-    '''A schematic is a list of strings. Each element a row, each character a column.
+    '''A schematic is a grid of characters. Each line a row, each character a column.
     '''
-    return s.splitlines()
+    return Grid.from_bytes(s.encode())
 
 
-def get_schematic_point(point: Point, schematic: Schematic) -> str:
-    '''Find the character at a given point in a schematic.
+@cached_parser()
+def read_schematic(input: str) -> Schematic:
+    '''Read a schematic from an input file.
     '''
-    x, y = point
-    return schematic[x][y]
+    return Grid.from_file(input)
 
 
-def is_symbol(char: str) -> bool:
-    '''Anything in a schematic that isn't a . or a number is a symbol.
+def find_symbols(schematic: Schematic) -> np.ndarray:
+    '''Mark the symbols in a schematic: anything that isn't a . or a number.
     '''
-    return not (char == '.' or char.isdigit())
+    return ~schematic.mask(b'.0123456789')
 
 
-def get_part_numbers(schematic: Schematic) -> List[PartNumber]:
-    '''Find all the part numbers in a schematic and their location.
-    
-    A part number's location is the (row, column) of its first digit in
-    the schematic.
+def label_part_numbers(schematic: Schematic) -> Tuple[np.ndarray, np.ndarray]:
+    '''Find all the numbers in a schematic, in reading order.
+
+    Returns the numbers, and an array the shape of the schematic that holds,
+    for each digit, the index of the number it belongs to (-1 elsewhere).
     '''
-    part_nos = []
-    for i, row in enumerate(schematic):
-        # Find all the part numbers in a row of the schematic
-        row_part_nos = re.finditer('\d+', row)
-
-        # Find the location of the part number in the row.
-        # If this part number was already found in the schematic,
-        # add this location to the others.
-        for part_no in row_part_nos:
-            part_nos.append(PartNumber(int(part_no.group()), (i, part_no.start())))
-    
-    return part_nos
-            
+    digits = schematic.mask(b'0123456789')
+    starts, ends = schematic.runs(digits)
 
-def find_adjacent_points(part_no: PartNumber) -> List[Point]:
-    '''Given a part number in a schematic, find all the points adjacent to the 
-    part number's location.
+    # A column of dots keeps numbers at the end of one row and the start of
+    # the next apart.
+    padded = np.hstack([schematic.cells, np.full((schematic.shape[0], 1), ord('.'), dtype = np.uint8)])
+    numbers = int_array(padded.tobytes(), negative = False)
+
+    labels = np.full(schematic.size, -1)
+    labels[digits.ravel()] = np.repeat(np.arange(len(starts)), ends - starts)
+    return numbers, labels.reshape(schematic.shape)
 
-    Points returned may extend beyond the dimensions of the schematic.
-    '''
-    row, start = part_no.schematic_location
-    end = start + len(str(part_no.number))
-    
-    number_pts = [(row, x) for x in range(start, end)]
-    bordered_rows = list(range(max(row - 1, 0), row + 2))
-    bordered_cols = list(range(max(start - 1, 0), end + 1))
-   
-    return [(i, j) for i in bordered_rows for j in bordered_cols if (i, j) not in number_pts]
 
+def get_part_numbers(schematic: Schematic) -> List[PartNumber]:
+    '''Find all the part numbers in a schematic and their location.
 
-def find_adjacent_symbols(part_no: PartNumber, schematic: Schematic) -> bool:
-    '''Given a part number in a schematic, find all the symbols adjacent to it
+    A part number's location is the (row, column) of its first digit in
+    the schematic.
     '''
-    symbols = []
-
-    for pt in find_adjacent_points(part_no):
-        try:
-            char = get_schematic_point(pt, schematic)
-            if is_symbol(char):
-                sym = Symbol(char, pt)
-                symbols.append(sym)
-        except IndexError:
-            pass
-    
-    return symbols
+    numbers, _ = label_part_numbers(schematic)
+    starts, _ = schematic.runs(schematic.mask(b'0123456789'))
+    rows, cols = schematic.to_coords(starts)
+    return [PartNumber(n, (i, j)) for n, i, j in zip(numbers.tolist(), rows.tolist(), cols.tolist())]
 
 
 def summarize_schematic(schematic: Schematic) -> int:
@@ -95,8 +73,12 @@ def summarize_schematic(schematic: Schematic) -> int:
     The same number can occur more than once in a schematic. It gets added to the sum
     every time it occurs and is adjacent to a symbol.
     '''
-    part_nos = get_part_numbers(schematic)
-    return sum(p.number for p in part_nos if find_adjacent_symbols(p, schematic))
+    numbers, labels = label_part_numbers(schematic)
+    near_symbol = dilate(find_symbols(schematic), ADJACENT)
+
+    is_part = np.zeros(len(numbers), dtype = bool)
+    is_part[labels[near_symbol & (labels >= 0)]] = True
+    return int(numbers[is_part].sum())
 
 
 def summarize_gear_ratios(schematic: Schematic) -> int:
@@ -105,15 +87,30 @@ def summarize_gear_ratios(schematic: Schematic) -> int:
     A gear has the symbol "*" and is adjacent to two part numbers. The gear
     ratio of the gear is the product of the two part numbers.
     '''
-    part_nos = get_part_numbers(schematic)
-    gears_parts = defaultdict(list)
-    
-    for part_no in part_nos:
-        for sym in find_adjacent_symbols(part_no, schematic):
-            if sym.symbol == '*':
-                gears_parts[sym].append(part_no.number)
+    numbers, labels = label_part_numbers(schematic)
+    gears = schematic.find(b'*')
+
+    # The labels around each gear, one row per gear
+    neighbours = schematic.neighbours(ADJACENT)[:, gears].T
+    around = np.where(neighbours >= 0, labels.ravel()[neighbours], -1)
 
-    return sum(parts[0] * parts[1] for gear, parts in gears_parts.items() if len(parts) == 2)
+    gears_parts = defaultdict(set)
+    for gear, label in zip(*np.nonzero(around >= 0)):
+        gears_parts[gear].add(around[gear, label])
+
+    return sum(int(numbers[list(parts)].prod()) for parts in gears_parts.values() if len(parts) == 2)
+
+
+def part_1(input: str) -> int:
+    '''Summarize the schematic in an input file.
+    '''
+    return summarize_schematic(read_schematic(input))
+
+
+def part_2(input: str) -> int:
+    '''Summarize the gear ratios of the schematic in an input file.
+    '''
+    return summarize_gear_ratios(read_schematic(input))
 
 
 # Example from the instructions
@@ -137,8 +134,6 @@ if __name__ == '__main__':
     assert summarize_gear_ratios(parse_schematic(test_01)) == 467835, "Test 2 failed"
     
     # Run on input
-    with open(input, 'rt') as f:
-        schematic = parse_schematic(f.read())
-        print('Part 1:', summarize_schematic(schematic))
-        print('Part 2:', summarize_gear_ratios(schematic))
+    print('Part 1:', part_1(input))
+    print('Part 2:', part_2(input))
  
@@ -0,0 +1,33 @@
+'''Advent of Code 2023: Day 03 input generator
+'''
+
+import random
+
+SYMBOLS = '*#+$/=@%&-'
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate an engine schematic of part numbers and symbols on a background of dots.
+
+    Part numbers in a row are always separated by something other than a digit.
+    A scale of 1 gives a schematic as large as the puzzle input (140 x 140).
+    '''
+    rng = random.Random(seed)
+    side = max(3, round(140 * scale ** 0.5))
+
+    rows = []
+    for _ in range(side):
+        row = []
+        while len(row) < side:
+            kind = rng.random()
+            if kind < 0.1:
+                number = str(rng.randint(1, 999))
+                row.extend(number[:side - len(row)])
+                row.append(rng.choice('.' * 8 + SYMBOLS))
+            elif kind < 0.14:
+                row.append(rng.choice(SYMBOLS))
+            else:
+                row.append('.')
+        rows.append(''.join(row[:side]) + '\n')
+
+    return ''.join(rows)
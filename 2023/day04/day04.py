@@ -1,8 +1,14 @@
 '''Advent of Code 2023: Day 04
 '''
 
+from collections import deque
 import re
-from typing import List, NamedTuple, FrozenSet
+from typing import Iterable, List, NamedTuple, FrozenSet, Tuple
+
+from aoc.cache import cached_parser
+from aoc.inputs import int_array, lines, read_ints
+
+CARD = re.compile(r'^Card\s+(\d+):([\d\s]*)\|([\d\s]*)$')
 
 class Card(NamedTuple):
     card_id: int
@@ -15,11 +21,18 @@ def parse_card(s: str) -> Card:
 
     A card has an ID, a list of winning numbers and a list of numbers "held."
     '''
-    id_str, winning_str, held_str = re.split(r'[:|]', s)
-    card_id = int(re.search('\d+$', id_str.strip())[0])
-    winning_numbers = frozenset(int(i) for i in winning_str.split())
-    held_numbers = [int(i) for i in held_str.split()]
-    return Card(card_id, winning_numbers, held_numbers)
+    match = CARD.match(s.strip())
+    if match is None:
+        raise ValueError(f'Could not parse card from "{s}".')
+
+    card_id, winning_str, held_str = match.groups()
+    return Card(int(card_id), frozenset(int(i) for i in winning_str.split()), [int(i) for i in held_str.split()])
+
+
+def make_card(numbers: List[int], n_winning: int) -> Card:
+    '''Create an instance of a card from its ID followed by its winning and held numbers.
+    '''
+    return Card(numbers[0], frozenset(numbers[1:n_winning + 1]), numbers[n_winning + 1:])
 
 def find_matches(card: Card) -> int:
     """Find the number of matches on a card.
@@ -59,6 +72,57 @@ def count_cards_won(cards: List[Card]) -> List[int]:
     return counts
 
 
+@cached_parser()
+def read_cards(input: str) -> List[Card]:
+    '''Read a pile of cards from an input file.
+
+    Every card has as many numbers as the first one, so all of them are
+    extracted at once.
+    '''
+    first = next(lines(input)).decode()
+    n_winning = len(re.split(r'[:|]', first)[1].split())
+    numbers = read_ints(input, stride = len(int_array(first.encode())))
+    return [make_card(row, n_winning) for row in numbers.tolist()]
+
+
+def part_1(input: str) -> int:
+    '''Sum the scores of the cards in an input file.
+    '''
+    return sum(score_card(card) for card in read_cards(input))
+
+
+def part_2(input: str) -> int:
+    '''Count the cards won from the pile of cards in an input file.
+    '''
+    return sum(count_cards_won(read_cards(input)))
+
+
+def solve_stream(lines: Iterable[str]) -> Tuple[int, int]:
+    '''Score the cards and count the cards won in one pass over lines of cards.
+
+    Copies are only ever won of the next few cards, so only the copies
+    pending for those are kept.
+    '''
+    total_score, total_cards = 0, 0
+    pending = deque()
+
+    for line in lines:
+        if not line.strip():
+            continue
+        card = parse_card(line)
+        total_score += score_card(card)
+
+        copies = 1 + (pending.popleft() if pending else 0)
+        total_cards += copies
+
+        n_matches = find_matches(card)
+        pending.extend([0] * (n_matches - len(pending)))
+        for j in range(n_matches):
+            pending[j] += copies
+
+    return total_score, total_cards
+
+
 # Example from the instructions
 test_01 = '''Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53
 Card 2: 13 32 20 16 61 | 61 30 68 82 17 32 24 19
@@ -75,9 +139,8 @@ if __name__ == '__main__':
     # Test example from instructions
     assert sum(score_card(parse_card(row)) for row in test_01.splitlines()) == 13, "Test 1 failed."
     assert sum(count_cards_won([parse_card(row) for row in test_01.splitlines()])) == 30, "Test 2 failed."
+    assert solve_stream(test_01.splitlines()) == (13, 30), "Stream test failed."
 
     # Run on input
-    with open(input, 'rt') as f:
-        cards = [parse_card(row) for row in f.read().splitlines()]
-        print('Part 1:', sum(score_card(card) for card in cards))
-        print('Part 2:', sum(count_cards_won(cards)))
\ No newline at end of file
+    print('Part 1:', part_1(input))
+    print('Part 2:', part_2(input))
\ No newline at end of file
@@ -0,0 +1,30 @@
+'''Advent of Code 2023: Day 04 input generator
+'''
+
+import random
+
+
+def generate(scale: float = 1, seed: int = 0) -> str:
+    '''Generate scratchcards, each with 10 winning numbers and 25 numbers held.
+
+    Most cards have no matches, and on average a card has fewer than one, so
+    the number of copies won stays bounded as the pile grows. No card wins
+    copies of cards past the end of the pile. A scale of 1 gives as many cards
+    as the puzzle input (200).
+    '''
+    rng = random.Random(seed)
+    ncards = max(1, round(200 * scale))
+    width = len(str(ncards))
+
+    cards = []
+    for i in range(1, ncards + 1):
+        numbers = rng.sample(range(1, 100), 35)
+        winning, others = numbers[:10], numbers[10:]
+        n_matches = 0 if rng.random() < 0.65 else rng.randint(1, 4)
+        n_matches = min(n_matches, ncards - i)
+        held = rng.sample(winning, n_matches) + others[:25 - n_matches]
+        rng.shuffle(held)
+        cards.append(f'Card {i:>{width}}: {" ".join(f"{n:>2}" for n in winning)} | '
+                     f'{" ".join(f"{n:>2}" for n in held)}\n')
+
+    return ''.join(cards)
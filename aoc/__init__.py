@@ -0,0 +1,2 @@
+'''Shared tooling for running the Advent of Code solutions.
+'''
@@ -0,0 +1,199 @@
+'''Benchmark the solvers and guard them against performance regressions.
+
+Each part is timed on its puzzle input and on generated inputs at several
+scales. Results can be saved as a JSON baseline, and later runs compared
+against it: a run fails when a part gets more than a set percentage slower
+than the baseline, or when its answer changes.
+
+    python -m aoc.bench 2022 --scales 1 10 --save baseline.json
+    python -m aoc.bench 2022 --scales 1 10 --compare baseline.json --threshold 20
+'''
+
+import argparse
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import platform
+import sys
+import tempfile
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from aoc.generate import write_input
+from aoc.runner import Result, Solver, default_input, find_solvers, format_size, run_tasks
+
+PUZZLE_INPUT = 'input'
+
+
+class Case(NamedTuple):
+    solver: Solver
+    label: str
+    input: Path
+
+    @property
+    def key(self) -> str:
+        return f'{self.solver.year}/{self.solver.day:02d}/part_{self.solver.part}/{self.label}'
+
+
+class Timing(NamedTuple):
+    answer: str
+    wall_time: float
+    cpu_time: float
+    peak_rss: int
+    error: Optional[str] = None
+
+
+def make_cases(solvers: Iterable[Solver],
+               scales: Iterable[float],
+               input_dir: Path,
+               seed: int = 0,
+               puzzle_input: bool = True) -> List[Case]:
+    '''Pair every solver with its puzzle input and with generated inputs at each scale.
+
+    Generated inputs are written to input_dir, once per day and scale.
+    '''
+    cases = []
+    generated: Dict[tuple, Optional[Path]] = {}
+
+    for solver in solvers:
+        if puzzle_input:
+            cases.append(Case(solver, PUZZLE_INPUT, default_input(solver)))
+
+        for scale in scales:
+            label = f'x{scale:g}'
+            key = (solver.year, solver.day, label)
+            if key not in generated:
+                path = input_dir / f'{solver.year}_day{solver.day:02d}_{label}.txt'
+                try:
+                    generated[key] = write_input(solver.year, solver.day, path, scale = scale, seed = seed)
+                except FileNotFoundError as e:
+                    print(f'Skipping generated inputs: {e}', file = sys.stderr)
+                    generated[key] = None
+            if generated[key]:
+                cases.append(Case(solver, label, generated[key]))
+
+    return cases
+
+
+def run_cases(cases: List[Case], repeat: int = 1, jobs: Optional[int] = 1) -> Dict[str, Timing]:
+    '''Time every case, keeping the fastest of repeated runs.
+    '''
+    runs: List[List[Result]] = [run_tasks(((c.solver, c.input) for c in cases), jobs) for _ in range(repeat)]
+
+    timings = {}
+    for case, results in zip(cases, zip(*runs)):
+        timings[case.key] = Timing(answer = str(results[0].answer),
+                                   wall_time = min(r.wall_time for r in results),
+                                   cpu_time = min(r.cpu_time for r in results),
+                                   peak_rss = max(r.peak_rss for r in results),
+                                   error = next((r.error for r in results if r.error), None))
+
+    return timings
+
+
+def save_baseline(timings: Dict[str, Timing], path: Path) -> None:
+    '''Save timings as a JSON baseline.
+    '''
+    baseline = {'created': datetime.now().isoformat(timespec = 'seconds'),
+                'python': platform.python_version(),
+                'machine': platform.platform(),
+                'cases': {key: t._asdict() for key, t in timings.items()}}
+    Path(path).write_text(json.dumps(baseline, indent = 2) + '\n')
+
+
+def load_baseline(path: Path) -> Dict[str, Timing]:
+    '''Load timings from a JSON baseline.
+    '''
+    baseline = json.loads(Path(path).read_text())
+    return {key: Timing(**t) for key, t in baseline['cases'].items()}
+
+
+def find_regressions(timings: Dict[str, Timing],
+                     baseline: Dict[str, Timing],
+                     threshold: float = 20,
+                     min_time: float = 0.01) -> List[str]:
+    '''Compare timings to a baseline and describe every regression.
+
+    A case regresses when it errors, when its answer differs from the
+    baseline, or when its wall time grows by more than threshold percent.
+    Cases faster than min_time seconds in the baseline are too noisy to time,
+    so only their answers are checked.
+    '''
+    regressions = []
+    for key, t in timings.items():
+        if t.error:
+            regressions.append(f'{key}: {t.error}')
+            continue
+        if key not in baseline:
+            continue
+
+        base = baseline[key]
+        if t.answer != base.answer:
+            regressions.append(f'{key}: answer changed from {base.answer!r} to {t.answer!r}')
+        elif base.wall_time >= min_time and t.wall_time > base.wall_time * (1 + threshold / 100):
+            change = 100 * (t.wall_time / base.wall_time - 1)
+            regressions.append(f'{key}: {base.wall_time:.3f}s -> {t.wall_time:.3f}s (+{change:.0f}%)')
+
+    return regressions
+
+
+def format_timings(timings: Dict[str, Timing], baseline: Optional[Dict[str, Timing]] = None) -> str:
+    '''Lay out timings as a table, with the change from the baseline when there is one.
+    '''
+    header = f'{"case":<24} {"wall":>9} {"cpu":>9} {"peak rss":>10}'
+    if baseline:
+        header += f' {"baseline":>9} {"change":>8}'
+    rows = [header, '-' * len(header)]
+
+    for key, t in timings.items():
+        row = f'{key:<24} {t.wall_time:>8.3f}s {t.cpu_time:>8.3f}s {format_size(t.peak_rss):>10}'
+        if baseline and key in baseline:
+            base = baseline[key].wall_time
+            change = f'{100 * (t.wall_time / base - 1):+.0f}%' if base > 0 else ''
+            row += f' {base:>8.3f}s {change:>8}'
+        rows.append(row + (f'  ERROR {t.error}' if t.error else ''))
+
+    return '\n'.join(rows)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog = 'python -m aoc.bench', description = __doc__.splitlines()[0])
+    parser.add_argument('years', nargs = '*', type = int, help = 'years to benchmark (default: all)')
+    parser.add_argument('-d', '--days', nargs = '+', type = int, help = 'days to benchmark (default: all)')
+    parser.add_argument('-p', '--parts', nargs = '+', type = int, choices = (1, 2), help = 'parts to benchmark (default: both)')
+    parser.add_argument('--scales', nargs = '*', type = float, default = [1], help = 'sizes of generated inputs, relative to the puzzle input (default: 1)')
+    parser.add_argument('--seed', type = int, default = 0, help = 'seed for generated inputs')
+    parser.add_argument('--no-puzzle-input', action = 'store_true', help = 'only benchmark generated inputs')
+    parser.add_argument('-r', '--repeat', type = int, default = 3, help = 'runs per case, keeping the fastest (default: 3)')
+    parser.add_argument('-j', '--jobs', type = int, default = 1, help = 'worker processes (default: 1, for steadier timings)')
+    parser.add_argument('--cache', action = 'store_true', help = 'cache parsed inputs on disk (sets AOC_CACHE=1)')
+    parser.add_argument('--save', type = Path, help = 'save the results as a baseline')
+    parser.add_argument('--compare', type = Path, help = 'baseline to compare the results to')
+    parser.add_argument('--threshold', type = float, default = 20, help = 'percent slowdown that counts as a regression (default: 20)')
+    parser.add_argument('--min-time', type = float, default = 0.01, help = 'baseline seconds below which timings are not compared (default: 0.01)')
+    args = parser.parse_args(argv)
+
+    if args.cache:
+        os.environ['AOC_CACHE'] = '1'
+
+    solvers = [s for s in find_solvers(args.years, args.days) if not args.parts or s.part in args.parts]
+
+    with tempfile.TemporaryDirectory(prefix = 'aoc_bench_') as input_dir:
+        cases = make_cases(solvers, args.scales, Path(input_dir), args.seed, not args.no_puzzle_input)
+        timings = run_cases(cases, args.repeat, args.jobs)
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    print(format_timings(timings, baseline))
+
+    if args.save:
+        save_baseline(timings, args.save)
+        print(f'\nSaved baseline to {args.save}.')
+
+    regressions = find_regressions(timings, baseline or {}, args.threshold, args.min_time)
+    if regressions:
+        print(f'\n{len(regressions)} regression(s):\n' + '\n'.join(regressions))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+'''Cache parsed puzzle inputs on disk.
+
+Parsers that read an input file can be wrapped with `cached_parser`. The cache
+is keyed by the hash of the file's contents, the parser and the parser's
+version, so editing an input invalidates its entries and bumping the version
+invalidates a parser's. NumPy arrays are stored as .npz files and everything
+else is pickled.
+
+Caching is off unless the AOC_CACHE environment variable is set to 1 (the
+runner's and the benchmarks' --cache flag sets it). Entries go in AOC_CACHE_DIR,
+or .aoc_cache at the root of the repository.
+'''
+
+import functools
+import hashlib
+import os
+from pathlib import Path
+import pickle
+import shutil
+import tempfile
+from typing import Any, Callable, Optional, TypeVar
+
+from aoc.instrument import instrumented
+
+ROOT = Path(__file__).resolve().parent.parent
+
+Parser = TypeVar('Parser', bound = Callable[..., Any])
+
+
+def cache_enabled() -> bool:
+    return os.environ.get('AOC_CACHE', '0') == '1'
+
+
+def cache_dir() -> Path:
+    return Path(os.environ.get('AOC_CACHE_DIR', ROOT / '.aoc_cache'))
+
+
+def file_digest(path: str | os.PathLike) -> str:
+    '''Hash the contents of a file.
+    '''
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(2**20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(path: str | os.PathLike, parser: Callable, version: int) -> str:
+    name = f'{parser.__module__}.{parser.__qualname__}:v{version}:{file_digest(path)}'
+    return hashlib.sha256(name.encode()).hexdigest()[:32]
+
+
+def _is_array(value: Any) -> bool:
+    return type(value).__module__ == 'numpy' and type(value).__name__ == 'ndarray'
+
+
+def _write_atomic(path: Path, write: Callable[[Any], None]) -> None:
+    path.parent.mkdir(parents = True, exist_ok = True)
+    with tempfile.NamedTemporaryFile(dir = path.parent, delete = False) as f:
+        write(f)
+    os.replace(f.name, path)
+
+
+def save_entry(key: str, value: Any) -> None:
+    '''Store a parsed value, as .npz for NumPy arrays (or tuples of them), or pickled.
+    '''
+    entry = cache_dir() / key
+    if _is_array(value) or (isinstance(value, tuple) and value and all(_is_array(v) for v in value)):
+        import numpy as np
+        arrays = value if isinstance(value, tuple) else (value,)
+        _write_atomic(entry.with_suffix('.npz'),
+                      lambda f: np.savez(f, *arrays, is_tuple = isinstance(value, tuple)))
+    else:
+        _write_atomic(entry.with_suffix('.pkl'),
+                      lambda f: pickle.dump(value, f, protocol = pickle.HIGHEST_PROTOCOL))
+
+
+def load_entry(key: str) -> Optional[tuple]:
+    '''Load a parsed value as a 1-tuple, or None if it isn't cached or can't be read.
+    '''
+    entry = cache_dir() / key
+    try:
+        if entry.with_suffix('.npz').exists():
+            import numpy as np
+            with np.load(entry.with_suffix('.npz')) as npz:
+                arrays = tuple(npz[f'arr_{i}'] for i in range(len(npz.files) - 1))
+                return (arrays if npz['is_tuple'] else arrays[0],)
+        if entry.with_suffix('.pkl').exists():
+            with open(entry.with_suffix('.pkl'), 'rb') as f:
+                return (pickle.load(f),)
+    except Exception:
+        # Unreadable entries (e.g. pickles of classes that have since changed)
+        # are treated as misses and overwritten.
+        return None
+
+    return None
+
+
+def cached_parser(version: int = 1) -> Callable[[Parser], Parser]:
+    '''Cache what a parser returns for an input file.
+
+    The parser must take the path to the input file as its only argument, and
+    its result must not depend on anything but the file's contents. Bump the
+    version whenever the parser's output changes. Parsers are instrumented
+    as the "parse" stage.
+    '''
+    def decorator(parser: Parser) -> Parser:
+        @instrumented('parse')
+        @functools.wraps(parser)
+        def wrapper(path):
+            if not cache_enabled():
+                return parser(path)
+
+            key = cache_key(path, parser, version)
+            cached = load_entry(key)
+            if cached is not None:
+                return cached[0]
+
+            value = parser(path)
+            save_entry(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def clear_cache() -> None:
+    '''Remove every cached entry.
+    '''
+    shutil.rmtree(cache_dir(), ignore_errors = True)
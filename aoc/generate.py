@@ -0,0 +1,53 @@
+'''Generate synthetic puzzle inputs of any size.
+
+Every day has a generator module next to its solver (dayNN_generator.py) with a
+`generate(scale, seed)` function. It returns an input in the same text format
+as the puzzle input, and a scale of 1 is about the size of the puzzle input.
+
+    python -m aoc.generate 2021 5 --scale 100 --seed 1 -o day05_x100.txt
+'''
+
+import argparse
+from pathlib import Path
+import sys
+from typing import Callable, List, Optional
+
+from aoc.runner import ROOT, load_module
+
+Generator = Callable[..., str]
+
+
+def find_generator(year: int, day: int, root: Path = ROOT) -> Generator:
+    '''Find the input generator for a day.
+    '''
+    paths = sorted((root / str(year)).glob(f'**/day{day:02d}_generator.py'))
+    if not paths:
+        raise FileNotFoundError(f'No input generator for {year} day {day}.')
+    return load_module(paths[0]).generate
+
+
+def write_input(year: int, day: int, path: Path, scale: float = 1, seed: int = 0) -> Path:
+    '''Generate an input for a day and write it to a file.
+    '''
+    path = Path(path)
+    path.write_text(find_generator(year, day)(scale = scale, seed = seed))
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog = 'python -m aoc.generate', description = __doc__.splitlines()[0])
+    parser.add_argument('year', type = int)
+    parser.add_argument('day', type = int)
+    parser.add_argument('-s', '--scale', type = float, default = 1, help = 'size relative to the puzzle input (default: 1)')
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('-o', '--output', type = Path, help = 'file to write to (default: stdout)')
+    args = parser.parse_args(argv)
+
+    if args.output:
+        write_input(args.year, args.day, args.output, args.scale, args.seed)
+    else:
+        sys.stdout.write(find_generator(args.year, args.day)(scale = args.scale, seed = args.seed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+'''Rectangular grids of characters, as found in many puzzle inputs.
+
+A Grid keeps one byte per cell in a 2D uint8 array, read straight from the
+input's bytes. Instead of visiting cells one at a time, days work on whole
+arrays: compare the cells to a character to get a mask, shift masks and cells
+around to look at neighbours, and convert between flat indices and
+(row, col) coordinates when a search needs a single number per cell.
+'''
+
+from dataclasses import dataclass
+import os
+from typing import Iterable, Tuple
+
+import numpy as np
+
+from aoc.inputs import Buffer, mapped
+
+Coord = Tuple[int, int]
+Offset = Tuple[int, int]
+
+ORTHOGONAL: Tuple[Offset, ...] = ((-1, 0), (0, 1), (1, 0), (0, -1))
+DIAGONAL: Tuple[Offset, ...] = ((-1, -1), (-1, 1), (1, 1), (1, -1))
+ADJACENT: Tuple[Offset, ...] = ORTHOGONAL + DIAGONAL
+
+
+def shift(cells: np.ndarray, offset: Offset, fill = 0) -> np.ndarray:
+    '''Shift an array so that each cell holds the value of the cell at offset from it.
+
+    Cells whose offset falls outside the array get the fill value.
+    '''
+    dr, dc = offset
+    nrows, ncols = cells.shape
+    shifted = np.full_like(cells, fill)
+    if abs(dr) < nrows and abs(dc) < ncols:
+        shifted[max(-dr, 0):nrows - max(dr, 0), max(-dc, 0):ncols - max(dc, 0)] = \
+            cells[max(dr, 0):nrows + min(dr, 0), max(dc, 0):ncols + min(dc, 0)]
+    return shifted
+
+
+def dilate(mask: np.ndarray, offsets: Iterable[Offset] = ADJACENT) -> np.ndarray:
+    '''Grow a boolean mask to every cell that has a masked cell at one of the offsets.
+    '''
+    grown = mask.copy()
+    for offset in offsets:
+        grown |= shift(mask, offset, False)
+    return grown
+
+
+@dataclass
+class Grid:
+    cells: np.ndarray
+
+    @classmethod
+    def from_bytes(cls, buf: Buffer) -> 'Grid':
+        '''Create a grid from lines of equal length.
+        '''
+        data = np.frombuffer(buf, dtype = np.uint8)
+        newlines = np.flatnonzero(data == ord('\n'))
+        ncols = int(newlines[0]) if len(newlines) else len(data)
+        # Pad a missing final line ending so every row is ncols + 1 bytes
+        if len(data) and data[-1] != ord('\n'):
+            data = np.append(data, np.uint8(ord('\n')))
+        if len(data) % (ncols + 1):
+            raise ValueError('Grid rows must all be the same length.')
+
+        cells = data.reshape(-1, ncols + 1)[:, :ncols]
+        if ncols and (cells[:, -1] == ord('\r')).all():
+            cells = cells[:, :-1]
+        # Always copy, so the grid never holds a view of a mapped file
+        return cls(cells.copy())
+
+    @classmethod
+    def from_file(cls, path: str | os.PathLike) -> 'Grid':
+        '''Read a grid from an input file.
+        '''
+        with mapped(path) as buf:
+            return cls.from_bytes(buf)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.cells.shape
+
+    @property
+    def size(self) -> int:
+        return self.cells.size
+
+    def __getitem__(self, key):
+        return self.cells[key]
+
+    def __str__(self) -> str:
+        return '\n'.join(row.tobytes().decode() for row in self.cells)
+
+    def mask(self, chars: bytes) -> np.ndarray:
+        '''Mark the cells holding any of the characters.
+        '''
+        return np.isin(self.cells, np.frombuffer(chars, dtype = np.uint8))
+
+    def find(self, char: bytes) -> np.ndarray:
+        '''Flat indices of the cells holding a character.
+        '''
+        return np.flatnonzero(self.cells == ord(char))
+
+    def shifted(self, offset: Offset, fill = 0) -> np.ndarray:
+        '''The cells shifted so that each holds the value of the cell at offset from it.
+        '''
+        return shift(self.cells, offset, fill)
+
+    def to_flat(self, coords) -> np.ndarray:
+        '''Convert (row, col) coordinates, or arrays of rows and cols, to flat indices.
+        '''
+        return np.ravel_multi_index(coords, self.shape)
+
+    def to_coords(self, index) -> Tuple[np.ndarray, np.ndarray]:
+        '''Convert flat indices to (rows, cols).
+        '''
+        return np.unravel_index(index, self.shape)
+
+    def neighbours(self, offsets: Iterable[Offset] = ORTHOGONAL) -> np.ndarray:
+        '''The flat index of each cell's neighbour at every offset.
+
+        Returns an array of shape (len(offsets), size), with -1 where a
+        neighbour would fall outside the grid.
+        '''
+        index = np.arange(self.size).reshape(self.shape)
+        return np.stack([shift(index, offset, -1).ravel() for offset in offsets])
+
+    def runs(self, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        '''Find horizontal runs of masked cells.
+
+        Returns the flat index of the first cell of each run and the flat
+        index just past its last cell, in reading order.
+        '''
+        starts = mask & ~shift(mask, (0, -1), False)
+        ends = mask & ~shift(mask, (0, 1), False)
+        return np.flatnonzero(starts), np.flatnonzero(ends) + 1
@@ -0,0 +1,173 @@
+'''Read puzzle inputs as raw bytes.
+
+Nothing is decoded unless a parser asks for text. Lines come from iterating
+the file in binary mode, and blank-line separated records and integers from
+the file's memory-mapped bytes, split by C code rather than Python loops.
+int_array and read_ints pull every integer out in one vectorized pass, for
+parsers that don't need to look at anything else, and count_values tallies
+them. Parsers that do need text
+decode the whole file at once with text_lines, not line by line.
+'''
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import mmap
+import os
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+Buffer = bytes | mmap.mmap
+
+
+@contextmanager
+def mapped(path: str | os.PathLike) -> Iterator[Buffer]:
+    '''Memory-map an input file for reading.
+
+    Empty files can't be mapped, so they come back as empty bytes.
+    '''
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def lines(path: str | os.PathLike) -> Iterator[bytes]:
+    '''Iterate over the lines of an input file, without their line endings.
+    '''
+    with open(path, 'rb') as f:
+        for line in f:
+            yield line.rstrip(b'\r\n')
+
+
+def text_lines(path: str | os.PathLike) -> List[str]:
+    '''Read the lines of an input file as text, without their line endings.
+
+    The whole file is decoded and split in one go.
+    '''
+    with open(path, 'rb') as f:
+        return f.read().decode().splitlines()
+
+
+def records(path: str | os.PathLike, separator: bytes = b'\n\n') -> Iterator[bytes]:
+    '''Iterate over the records of an input file separated by blank lines.
+
+    Leading and trailing whitespace is stripped from each record, and empty
+    records are skipped. Only one record at a time is copied out of the file.
+    '''
+    with mapped(path) as buf:
+        start = 0
+        while start < len(buf):
+            end = buf.find(separator, start)
+            if end < 0:
+                end = len(buf)
+            record = buf[start:end].strip()
+            if record:
+                yield record
+            start = end + len(separator)
+
+
+def int_array(buf: Buffer, stride: Optional[int] = None, negative: bool = True) -> np.ndarray:
+    '''Extract every integer in a bytes buffer into an int64 array.
+
+    Digits are found and combined with NumPy, so no Python objects are made
+    per number. With a stride, the array is reshaped to rows of that many
+    integers. A "-" right before a number makes it negative, unless negative
+    is False (for inputs like "2-4" where "-" separates numbers). Numbers
+    must fit in an int64.
+    '''
+    data = np.frombuffer(buf, dtype = np.uint8)
+    # Bytes below '0' wrap around, so this is true for '0'-'9' only
+    is_digit = (data - np.uint8(ord('0'))) < 10
+    edges = np.flatnonzero(is_digit[1:] != is_digit[:-1]) + 1
+    if len(data) and is_digit[0]:
+        edges = np.r_[0, edges]
+    if len(data) and is_digit[-1]:
+        edges = np.r_[edges, len(data)]
+    starts, ends = edges[0::2], edges[1::2]
+    del is_digit, edges
+
+    # Add up the numbers a place at a time, from the units up, so the work
+    # and memory scale with the count of numbers rather than of digits.
+    values = np.zeros(len(starts), dtype = np.int64)
+    lengths = ends - starts
+    place = 1
+    for k in range(int(lengths.max(initial = 0))):
+        live = np.flatnonzero(lengths > k) if k else slice(None)
+        values[live] += (data[ends[live] - 1 - k] - np.int64(ord('0'))) * place
+        place *= 10
+
+    if negative and len(starts):
+        signed = (starts > 0) & (data[np.maximum(starts - 1, 0)] == ord('-'))
+        values[signed] *= -1
+
+    del data
+    if stride is not None:
+        if len(values) % stride:
+            raise ValueError(f'Found {len(values)} integers, which is not a multiple of {stride}.')
+        values = values.reshape(-1, stride)
+    return values
+
+
+def read_ints(path: str | os.PathLike, stride: Optional[int] = None, negative: bool = True) -> np.ndarray:
+    '''Extract every integer in an input file into an int64 array.
+
+    See int_array.
+    '''
+    with mapped(path) as buf:
+        return int_array(buf, stride, negative)
+
+
+def count_values(values: np.ndarray) -> Counter:
+    '''Count how often each value occurs in an array.
+    '''
+    keys, counts = np.unique(values, return_counts = True)
+    return Counter(dict(zip(keys.tolist(), counts.tolist())))
+
+
+def chunk_ranges(path: str | os.PathLike, chunk_size: int = 2**26) -> List[Tuple[int, int]]:
+    '''Split an input file into byte ranges of about chunk_size that end on line breaks.
+
+    Each range can then be read and parsed on its own, e.g. by a worker
+    process, without any line being split between two of them.
+    '''
+    ranges = []
+    with mapped(path) as buf:
+        start = 0
+        while start < len(buf):
+            end = buf.find(b'\n', min(start + chunk_size, len(buf)) - 1)
+            end = len(buf) if end < 0 else end + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def read_range(path: str | os.PathLike, start: int, end: int) -> bytes:
+    '''Read a byte range of an input file.
+    '''
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return f.read(end - start)
+
+
+def map_chunks(func: Callable[[str | os.PathLike, int, int], Any],
+               path: str | os.PathLike,
+               chunk_size: int = 2**26,
+               jobs: Optional[int] = None) -> List[Any]:
+    '''Call func(path, start, end) on every chunk of an input file, across a
+    pool of worker processes (one per CPU by default).
+
+    The chunks are those of chunk_ranges, and the results come back in the
+    order of the chunks. func must be picklable, e.g. a module-level
+    function or a functools.partial of one.
+    '''
+    ranges = chunk_ranges(path, chunk_size)
+    if not ranges:
+        return []
+
+    starts, ends = zip(*ranges)
+    with ProcessPoolExecutor(max_workers = min(jobs or os.cpu_count() or 1, len(ranges))) as pool:
+        return list(pool.map(func, [path] * len(ranges), starts, ends))
@@ -0,0 +1,113 @@
+'''Record where a solver spends its time, stage by stage.
+
+A stage is a named block of work: the runner records each part as "part_1" or
+"part_2", parsers wrapped with `cached_parser` are recorded as "parse", and
+any other function can be added with the `instrumented` decorator. For every
+stage we count its calls, their total (inclusive) time, the memory they
+allocate and keep, and their peak allocation above what was live on entry.
+
+Instrumentation is off unless the AOC_PROFILE environment variable is set to
+1 (the runner's --profile flag sets it). When it's off, `instrumented` hands
+back the function it was given and `stage` does nothing, so the solvers run
+exactly as they otherwise would. Memory is traced with tracemalloc, which
+slows instrumented runs down considerably; compare their times to each other,
+not to uninstrumented runs.
+'''
+
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+import functools
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+Function = TypeVar('Function', bound = Callable[..., Any])
+
+
+def instrumentation_enabled() -> bool:
+    return os.environ.get('AOC_PROFILE', '0') == '1'
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    time: float = 0
+    # Bytes allocated and still live when the stage returned, summed over calls
+    net_bytes: int = 0
+    # Most bytes allocated at once during a call, above what was live on entry
+    peak_bytes: int = 0
+
+
+_stats: Dict[str, StageStats] = {}
+# Peak memory seen by each open stage, so an inner stage resetting
+# tracemalloc's peak doesn't lose it for the stages around it
+_open_peaks: List[int] = []
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    '''Record a block of work as a named stage, when instrumentation is on.
+    '''
+    if not instrumentation_enabled():
+        yield
+        return
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    start_bytes, outer_peak = tracemalloc.get_traced_memory()
+    if _open_peaks:
+        _open_peaks[-1] = max(_open_peaks[-1], outer_peak)
+    tracemalloc.reset_peak()
+    _open_peaks.append(start_bytes)
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        end_bytes, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, _open_peaks.pop())
+        if _open_peaks:
+            _open_peaks[-1] = max(_open_peaks[-1], peak)
+
+        stats = _stats.setdefault(name, StageStats())
+        stats.calls += 1
+        stats.time += elapsed
+        stats.net_bytes += end_bytes - start_bytes
+        stats.peak_bytes = max(stats.peak_bytes, peak - start_bytes)
+
+
+def instrumented(name: Optional[str] = None) -> Callable[[Function], Function]:
+    '''Record every call to a function as a stage, named after the function by default.
+
+    Whether to instrument is decided when the function is decorated, so with
+    instrumentation off the function is returned untouched.
+    '''
+    def decorator(func: Function) -> Function:
+        if not instrumentation_enabled():
+            return func
+
+        stage_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def reset_stats() -> None:
+    '''Forget every stage recorded so far.
+    '''
+    _stats.clear()
+
+
+def stage_stats() -> Dict[str, Dict[str, Any]]:
+    '''The stages recorded so far, as plain dictionaries for JSON reports.
+    '''
+    return {name: asdict(stats) for name, stats in _stats.items()}
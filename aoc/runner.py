@@ -0,0 +1,322 @@
+'''Run the Advent of Code solutions for whole years, or chosen days, in one go.
+
+Every day's module exposes its answers as `part_1` and `part_2` functions that
+take the path to an input file. The runner finds those modules, imports them,
+and runs each part across a process pool, timing every part as it goes.
+
+    python -m aoc 2021 2022 --days 1 5 --jobs 4
+
+With --profile, each part also records its stages (see aoc.instrument) and
+writes them to a JSON report.
+'''
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import importlib.util
+import json
+import os
+from pathlib import Path
+import re
+import sys
+import time
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from aoc.instrument import instrumentation_enabled, reset_stats, stage, stage_stats
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Day modules are either dayNN.py in their own dayNN directory (2021, 2023)
+# or dayNN_PP.py directly in the year's directory (2022).
+MODULE_PATTERN = re.compile(r'^day(?P<day>\d{2})(_\d{2})?\.py$')
+PARTS = (1, 2)
+
+# Unfinished drafts kept for reference, which don't import. 2022/day12_01.py
+# was abandoned for day12_02.py, which solves both parts of day 12.
+EXCLUDED = {'2022/day12_01.py'}
+
+
+class Solver(NamedTuple):
+    year: int
+    day: int
+    part: int
+    path: Path
+
+
+class Result(NamedTuple):
+    year: int
+    day: int
+    part: int
+    answer: Any
+    wall_time: float
+    cpu_time: float
+    peak_rss: int
+    error: Optional[str] = None
+    stages: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @property
+    def key(self) -> str:
+        return f'{self.year}/{self.day:02d}/part_{self.part}'
+
+
+def find_day_modules(root: Path = ROOT) -> Dict[int, Dict[int, List[Path]]]:
+    '''Find the module files for every day of every year, keyed by year and day.
+    '''
+    modules = {}
+    for year_dir in sorted(root.glob('[0-9][0-9][0-9][0-9]')):
+        for path in sorted(year_dir.glob('**/day*.py')):
+            match = MODULE_PATTERN.match(path.name)
+            if not match:
+                continue
+            # Skip stray modules that live in another day's directory
+            if path.parent != year_dir and path.parent.name != f'day{match["day"]}':
+                continue
+            if path.relative_to(root).as_posix() in EXCLUDED:
+                continue
+            day = int(match['day'])
+            modules.setdefault(int(year_dir.name), {}).setdefault(day, []).append(path)
+
+    return modules
+
+
+_loaded_modules: Dict[Path, ModuleType] = {}
+
+
+def load_module(path: Path) -> ModuleType:
+    '''Import a day's module from its file.
+
+    The module's directory is put on the path while it loads so that it can
+    import its siblings, the way it would when run as a script. The module is
+    registered under a unique name so that what it defines can be pickled.
+    '''
+    path = Path(path).resolve()
+    if path in _loaded_modules:
+        return _loaded_modules[path]
+
+    name = '_'.join(['aoc'] + list(path.relative_to(ROOT).with_suffix('').parts))
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+
+    sys.modules[name] = module
+    sys.path.insert(0, str(path.parent))
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    finally:
+        sys.path.remove(str(path.parent))
+
+    _loaded_modules[path] = module
+    return module
+
+
+def find_solvers(years: Optional[Iterable[int]] = None,
+                 days: Optional[Iterable[int]] = None,
+                 root: Path = ROOT) -> List[Solver]:
+    '''Find the solvers for each part of the chosen years and days (all by default).
+
+    Modules that can't be imported are reported and skipped.
+    '''
+    solvers = []
+    for year, year_modules in find_day_modules(root).items():
+        if years and year not in years:
+            continue
+        for day, paths in year_modules.items():
+            if days and day not in days:
+                continue
+            for path in paths:
+                try:
+                    module = load_module(path)
+                except Exception as e:
+                    print(f'Skipping {path.relative_to(root)}: {type(e).__name__}: {e}', file = sys.stderr)
+                    continue
+                solvers.extend(Solver(year, day, part, path) for part in PARTS
+                               if callable(getattr(module, f'part_{part}', None)))
+
+    return sorted(solvers)
+
+
+def default_input(solver: Solver) -> Path:
+    '''Find the puzzle input that sits next to a solver's module.
+    '''
+    inputs = sorted(solver.path.parent.glob(f'day{solver.day:02d}_input.*'))
+    if not inputs:
+        raise FileNotFoundError(f'No input found for {solver.year} day {solver.day}.')
+    return inputs[0]
+
+
+def _reset_peak_rss() -> None:
+    '''Reset the process's peak resident set size where the OS allows it (Linux).
+    '''
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _peak_rss() -> int:
+    '''Peak resident set size of this process in bytes.
+    '''
+    try:
+        with open('/proc/self/status', 'rt') as f:
+            for row in f:
+                if row.startswith('VmHWM:'):
+                    return int(row.split()[1]) * 1024
+    except OSError:
+        pass
+
+    import resource
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+def run_solver(solver: Solver, input: Optional[Path] = None) -> Result:
+    '''Run a single part on an input, measuring its wall time, CPU time and peak memory.
+
+    Errors raised by the solver are caught and recorded on the result. With
+    instrumentation on, the stages of the run are recorded on it too.
+    '''
+    answer, error = None, None
+    reset_stats()
+    _reset_peak_rss()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    try:
+        input = input or default_input(solver)
+        solve = getattr(load_module(solver.path), f'part_{solver.part}')
+        with stage(f'part_{solver.part}'):
+            answer = solve(str(input))
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+
+    wall_time = time.perf_counter() - wall_start
+    cpu_time = time.process_time() - cpu_start
+    stages = stage_stats() if instrumentation_enabled() else None
+
+    return Result(solver.year, solver.day, solver.part, answer, wall_time, cpu_time, _peak_rss(), error, stages)
+
+
+def run_tasks(tasks: Iterable[Tuple[Solver, Optional[Path]]],
+              jobs: Optional[int] = None) -> List[Result]:
+    '''Run solvers, each on its own input, across a pool of worker processes.
+
+    Results come back in the same order as the tasks. With a single job the
+    solvers run one after another in this process.
+    '''
+    tasks = list(tasks)
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1:
+        return [run_solver(solver, input) for solver, input in tasks]
+
+    with ProcessPoolExecutor(max_workers = min(jobs, len(tasks) or 1)) as pool:
+        futures = [pool.submit(run_solver, solver, input) for solver, input in tasks]
+        return [f.result() for f in futures]
+
+
+def run_solvers(solvers: Iterable[Solver],
+                input: Optional[Path] = None,
+                jobs: Optional[int] = None) -> List[Result]:
+    '''Run solvers on the same input (their puzzle inputs by default) across
+    a pool of worker processes.
+    '''
+    return sorted(run_tasks(((s, input) for s in solvers), jobs))
+
+
+def format_size(nbytes: int) -> str:
+    return f'{nbytes / 2**20:.1f} MB'
+
+
+def format_results(results: Iterable[Result]) -> str:
+    '''Lay out results as a table, one row per part.
+    '''
+    header = f'{"year":>4} {"day":>3} {"part":>4}  {"answer":>20} {"wall":>9} {"cpu":>9} {"peak rss":>10}'
+    rows = [header, '-' * len(header)]
+
+    for r in results:
+        answer = f'ERROR {r.error}' if r.error else str(r.answer)
+        first, *rest = answer.splitlines() or ['']
+        rows.append(f'{r.year:>4} {r.day:>3} {r.part:>4}  {first:>20} '
+                    f'{r.wall_time:>8.3f}s {r.cpu_time:>8.3f}s {format_size(r.peak_rss):>10}')
+        rows.extend(' ' * 15 + line for line in rest)
+
+    return '\n'.join(rows)
+
+
+def format_stages(results: Iterable[Result]) -> str:
+    '''Lay out the stages recorded for each part as a table, slowest first.
+    '''
+    header = f'{"part":<16} {"stage":<32} {"calls":>9} {"time":>9} {"net alloc":>10} {"peak alloc":>10}'
+    rows = [header, '-' * len(header)]
+
+    for r in results:
+        stages = sorted((r.stages or {}).items(), key = lambda s: -s[1]['time'])
+        for name, s in stages:
+            rows.append(f'{r.key:<16} {name:<32} {s["calls"]:>9} {s["time"]:>8.3f}s '
+                        f'{format_size(s["net_bytes"]):>10} {format_size(s["peak_bytes"]):>10}')
+
+    return '\n'.join(rows)
+
+
+def save_report(results: Iterable[Result], path: Path) -> None:
+    '''Save the stages recorded for each part as a JSON report, keyed by part.
+    '''
+    report = {r.key: r.stages for r in results if r.stages is not None}
+    Path(path).write_text(json.dumps(report, indent = 2) + '\n')
+
+
+SORT_KEYS = {'day': lambda r: (r.year, r.day, r.part),
+             'wall': lambda r: -r.wall_time,
+             'cpu': lambda r: -r.cpu_time,
+             'rss': lambda r: -r.peak_rss}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog = 'python -m aoc', description = __doc__.splitlines()[0])
+    parser.add_argument('years', nargs = '*', type = int, help = 'years to run (default: all)')
+    parser.add_argument('-d', '--days', nargs = '+', type = int, help = 'days to run (default: all)')
+    parser.add_argument('-p', '--parts', nargs = '+', type = int, choices = PARTS, help = 'parts to run (default: both)')
+    parser.add_argument('-i', '--input', type = Path, help = 'input file to use instead of the puzzle input (one day only)')
+    parser.add_argument('-j', '--jobs', type = int, help = 'worker processes (default: one per CPU)')
+    parser.add_argument('-s', '--sort', choices = SORT_KEYS, default = 'day', help = 'order of the results')
+    parser.add_argument('--cache', action = 'store_true', help = 'cache parsed inputs on disk (sets AOC_CACHE=1)')
+    parser.add_argument('--json', action = 'store_true', help = 'print the results as JSON')
+    parser.add_argument('--profile', type = Path, metavar = 'REPORT', help = 'record the stages of each part and save them as JSON (sets AOC_PROFILE=1)')
+    args = parser.parse_args(argv)
+
+    if args.cache:
+        os.environ['AOC_CACHE'] = '1'
+    if args.profile:
+        # Set before the day modules are imported, so their instrumented functions are wrapped
+        os.environ['AOC_PROFILE'] = '1'
+
+    solvers = [s for s in find_solvers(args.years, args.days) if not args.parts or s.part in args.parts]
+    if args.input and len(set((s.year, s.day) for s in solvers)) > 1:
+        parser.error('--input can only be used with a single year and day.')
+
+    start = time.perf_counter()
+    results = sorted(run_solvers(solvers, args.input, args.jobs), key = SORT_KEYS[args.sort])
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps([r._asdict() for r in results], default = str, indent = 2))
+    else:
+        print(format_results(results))
+        print(f'\n{len(results)} parts in {elapsed:.3f}s '
+              f'({sum(r.wall_time for r in results):.3f}s of solver time).')
+        if any(r.stages for r in results):
+            print('\n' + format_stages(results))
+
+    if args.profile:
+        save_report(results, args.profile)
+
+    if any(r.error for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+'''Shortest paths over grids, without building the graph node by node.
+
+A GridGraph links each cell of a grid to its neighbours at a set of offsets,
+keeping only the moves an edge rule allows. The rule is written over arrays,
+e.g. "the destination is at most one higher than the source", and is applied
+to every edge at once. Cells are numbered by their flat index in the grid, as
+with `Grid.to_flat`.
+
+Three searches run on it, each returning an array of distances from the
+sources (inf where a cell can't be reached) and, on request, an array of
+predecessors (-1 for sources and unreached cells) for `path_to`:
+
+- `bfs` when every move costs the same. It expands a whole frontier at a
+  time with NumPy, so it's linear in the size of the grid.
+- `dijkstra` when moves have weights, with a binary heap.
+- `astar` for a single target, guided by a heuristic.
+'''
+
+from dataclasses import dataclass
+import heapq
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from aoc.grid import ORTHOGONAL, Grid, Offset
+
+# An edge rule takes the values at the source and destination of each edge
+# and says which edges can be taken.
+EdgeRule = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+@dataclass
+class GridGraph:
+    shape: Tuple[int, int]
+    # (len(offsets), size) tables of each cell's neighbour at every offset,
+    # whether the move is allowed, and what it costs.
+    neighbours: np.ndarray
+    allowed: np.ndarray
+    weights: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_rule(cls,
+                  grid: Grid,
+                  values: np.ndarray,
+                  rule: Optional[EdgeRule] = None,
+                  offsets: Iterable[Offset] = ORTHOGONAL,
+                  weights: Optional[np.ndarray] = None) -> 'GridGraph':
+        '''Link every cell to the neighbours the rule allows moving to.
+
+        values has a value per cell (e.g. elevations) that the rule compares.
+        Without a rule, every move within the grid is allowed. weights, if
+        given, is the cost of moving into each cell.
+        '''
+        neighbours = grid.neighbours(tuple(offsets))
+        inside = neighbours >= 0
+        allowed = inside.copy()
+        if rule is not None:
+            flat = np.asarray(values).ravel()
+            sources = np.broadcast_to(flat, neighbours.shape)
+            allowed[inside] = rule(sources[inside], flat[neighbours[inside]])
+
+        edge_weights = None
+        if weights is not None:
+            edge_weights = np.where(inside, np.asarray(weights).ravel()[neighbours], np.inf)
+        return cls(grid.shape, neighbours, allowed, edge_weights)
+
+    @property
+    def size(self) -> int:
+        return self.shape[0] * self.shape[1]
+
+    def reversed(self) -> 'GridGraph':
+        '''The same graph with every edge pointing the other way.
+        '''
+        nsteps = len(self.neighbours)
+        # Each offset maps cells one-to-one, so the reverse of every edge at
+        # an offset can be stored in that offset's row of its destination.
+        dst, keep = self.neighbours, self.allowed
+        neighbours = np.full_like(dst, -1)
+        allowed = np.zeros_like(keep)
+        weights = None if self.weights is None else np.full(self.weights.shape, np.inf)
+        for k in range(nsteps):
+            rows = np.flatnonzero(keep[k])
+            neighbours[k, dst[k, rows]] = rows
+            allowed[k, dst[k, rows]] = True
+            if weights is not None:
+                weights[k, dst[k, rows]] = self.weights[k, rows]
+        return GridGraph(self.shape, neighbours, allowed, weights)
+
+
+def _start(graph: GridGraph, sources) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    sources = np.atleast_1d(np.asarray(sources, dtype = np.int64))
+    distances = np.full(graph.size, np.inf)
+    distances[sources] = 0
+    predecessors = np.full(graph.size, -1, dtype = np.int64)
+    return sources, distances, predecessors
+
+
+def bfs(graph: GridGraph, sources, predecessors: bool = False):
+    '''Find the fewest moves from any of the sources to every cell.
+
+    Returns the distances, and the predecessors too if asked for.
+    '''
+    frontier, distances, preds = _start(graph, sources)
+    steps = 0
+    while len(frontier):
+        steps += 1
+        moves = graph.allowed[:, frontier]
+        targets = graph.neighbours[:, frontier][moves]
+        origins = np.broadcast_to(frontier, moves.shape)[moves]
+
+        new = np.isinf(distances[targets])
+        # Keep the first move into each new cell
+        targets, first = np.unique(targets[new], return_index = True)
+        distances[targets] = steps
+        preds[targets] = origins[new][first]
+        frontier = targets
+
+    return (distances, preds) if predecessors else distances
+
+
+def dijkstra(graph: GridGraph, sources, targets = None, predecessors: bool = False):
+    '''Find the cheapest paths from any of the sources to every cell, using
+    the graph's weights (1 per move without them).
+
+    With targets, the search stops once all of them are settled, leaving
+    farther cells unexplored. Returns the distances, and the predecessors too
+    if asked for.
+    '''
+    sources, distances, preds = _start(graph, sources)
+    remaining = set(np.atleast_1d(targets).tolist()) if targets is not None else None
+    settled = np.zeros(graph.size, dtype = bool)
+    neighbours, allowed = graph.neighbours.T, graph.allowed.T
+    weights = graph.weights.T if graph.weights is not None else None
+
+    heap = [(0.0, int(s)) for s in sources]
+    heapq.heapify(heap)
+    while heap:
+        distance, node = heapq.heappop(heap)
+        if settled[node]:
+            continue
+        settled[node] = True
+        if remaining is not None:
+            remaining.discard(node)
+            if not remaining:
+                break
+
+        for k in np.flatnonzero(allowed[node]):
+            neighbour = int(neighbours[node, k])
+            new_distance = distance + (weights[node, k] if weights is not None else 1)
+            if new_distance < distances[neighbour]:
+                distances[neighbour] = new_distance
+                preds[neighbour] = node
+                heapq.heappush(heap, (new_distance, neighbour))
+
+    return (distances, preds) if predecessors else distances
+
+
+def manhattan(graph: GridGraph, target: int) -> Callable[[int], float]:
+    '''Grid distance to the target, a lower bound on the cost of orthogonal
+    moves that each cost at least 1.
+    '''
+    row, col = divmod(target, graph.shape[1])
+    return lambda node: abs(node // graph.shape[1] - row) + abs(node % graph.shape[1] - col)
+
+
+def astar(graph: GridGraph,
+          source: int,
+          target: int,
+          heuristic: Optional[Callable[[int], float]] = None) -> Tuple[float, List[int]]:
+    '''Find the cheapest path from the source to the target.
+
+    The heuristic estimates the cost from a cell to the target and must never
+    overestimate it (manhattan distance by default). Returns the cost (inf if
+    the target can't be reached) and the path, as flat indices.
+    '''
+    heuristic = heuristic or manhattan(graph, target)
+    _, distances, preds = _start(graph, source)
+    neighbours, allowed = graph.neighbours.T, graph.allowed.T
+    weights = graph.weights.T if graph.weights is not None else None
+    closed = np.zeros(graph.size, dtype = bool)
+
+    heap = [(heuristic(source), 0.0, source)]
+    while heap:
+        _, distance, node = heapq.heappop(heap)
+        if node == target:
+            return distance, path_to(preds, target)
+        if closed[node]:
+            continue
+        closed[node] = True
+
+        for k in np.flatnonzero(allowed[node]):
+            neighbour = int(neighbours[node, k])
+            new_distance = distance + (weights[node, k] if weights is not None else 1)
+            if new_distance < distances[neighbour]:
+                distances[neighbour] = new_distance
+                preds[neighbour] = node
+                heapq.heappush(heap, (new_distance + heuristic(neighbour), new_distance, neighbour))
+
+    return np.inf, []
+
+
+def path_to(predecessors: np.ndarray, target: int) -> List[int]:
+    '''Follow the predecessors back from a target to build the path that reached it.
+    '''
+    path = [int(target)]
+    while predecessors[path[-1]] >= 0:
+        path.append(int(predecessors[path[-1]]))
+    return path[::-1]
+
+
+# Example: the risk levels from Advent of Code 2021 day 15, as weights
+test_01 = '''1163751742
+1381373672
+2136511328
+3694931569
+7463417111
+1319128137
+1359912421
+3125421639
+1293138521
+2311944581'''
+
+
+if __name__ == '__main__':
+    grid = Grid.from_bytes(test_01.encode())
+    risks = grid.cells.astype(int) - ord('0')
+    graph = GridGraph.from_rule(grid, risks, weights = risks)
+    target = grid.size - 1
+
+    distances, preds = dijkstra(graph, 0, predecessors = True)
+    path = path_to(preds, target)
+    assert distances[target] == 40, "Dijkstra test failed"
+    assert path[0] == 0 and path[-1] == target, "Path test failed"
+    assert sum(risks.ravel()[path[1:]]) == 40, "Path cost test failed"
+    assert dijkstra(graph, 0, targets = target)[target] == 40, "Dijkstra targets test failed"
+
+    cost, path = astar(graph, 0, target)
+    assert cost == 40 and sum(risks.ravel()[path[1:]]) == 40, "A* test failed"
+
+    # Without weights every move costs 1, so BFS and Dijkstra agree
+    unweighted = GridGraph.from_rule(grid, risks)
+    assert (bfs(unweighted, 0) == dijkstra(unweighted, 0)).all(), "BFS test failed"
+    assert bfs(unweighted, 0)[target] == 18, "BFS distance test failed"
+
+    # Climbing at most one level at a time is one-way, so the reversed graph
+    # searched from the target gives the distances to it
+    climbing = GridGraph.from_rule(grid, risks, lambda src, dst: dst - src <= 1, weights = risks)
+    to_target = dijkstra(climbing.reversed(), target)
+    from_each = np.array([dijkstra(climbing, node, targets = target)[target] for node in range(grid.size)])
+    assert (to_target == from_each).all(), "Reversed test failed"
+    assert 0 < np.isfinite(to_target).sum() < grid.size, "Reversed reach test failed"
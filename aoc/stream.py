@@ -0,0 +1,68 @@
+'''Solve days in a single pass over their input, in bounded memory.
+
+Days that can be solved line by line expose `solve_stream(lines)`. It takes
+any iterable of lines (without their line endings), reads it once, and
+returns the answers to both parts. Only the state the puzzle needs is kept
+between lines (running counts, the last few readings, the cells visited), so
+inputs far larger than memory can be piped through.
+
+    python -m aoc.stream 2021 2 day02_input.txt
+    zcat readings.txt.gz | python -m aoc.stream 2021 1
+
+Generators build their whole input in memory, so piping aoc.generate into
+aoc.stream doesn't keep memory bounded.
+
+Grid days (2022 days 8 and 12, 2023 day 3) need the whole map at once and
+have no streaming solver.
+'''
+
+import argparse
+import sys
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from aoc.runner import find_day_modules, load_module
+
+StreamSolver = Callable[[Iterable[str]], Tuple[Any, Any]]
+
+
+def read_stream(source: Optional[str] = None) -> Iterator[str]:
+    '''Iterate over the lines of a file, or of stdin when the source is None or "-".
+    '''
+    if source is None or source == '-':
+        for line in sys.stdin.buffer:
+            yield line.rstrip(b'\r\n').decode()
+    else:
+        with open(source, 'rb') as f:
+            for line in f:
+                yield line.rstrip(b'\r\n').decode()
+
+
+def find_stream_solver(year: int, day: int) -> StreamSolver:
+    '''Find the streaming solver among a day's modules.
+    '''
+    for path in find_day_modules().get(year, {}).get(day, []):
+        solve = getattr(load_module(path), 'solve_stream', None)
+        if callable(solve):
+            return solve
+
+    raise LookupError(f'{year} day {day} has no streaming solver.')
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog = 'python -m aoc.stream', description = __doc__.splitlines()[0])
+    parser.add_argument('year', type = int)
+    parser.add_argument('day', type = int)
+    parser.add_argument('input', nargs = '?', default = '-', help = 'input file (default: stdin)')
+    args = parser.parse_args(argv)
+
+    try:
+        solve = find_stream_solver(args.year, args.day)
+    except LookupError as e:
+        parser.error(str(e))
+
+    for part, answer in enumerate(solve(read_stream(args.input)), start = 1):
+        print(f'Part {part}:', answer)
+
+
+if __name__ == '__main__':
+    main()